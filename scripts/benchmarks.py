@@ -0,0 +1,1623 @@
+"""
+Benchmarks of the data load scripts.
+
+Run from the repository root, e.g. `python scripts/benchmarks.py cold_start`.
+"""
+from datetime import datetime as dt
+from orjson import loads as jsonloads
+import subprocess
+import time
+import sys
+import os
+
+
+SCRIPTS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+EDITIONS_FIXTURE = os.path.join(SCRIPTS_DIRECTORY, "fixtures", "ol_editions.jsonl")
+UKRAINIAN_TITLES_FIXTURE = os.path.join(SCRIPTS_DIRECTORY, "fixtures", "ukrainian_titles.txt")
+EDITION_FIELDS_FIXTURE = os.path.join(SCRIPTS_DIRECTORY, "fixtures", "ol_edition_fields.json")
+ISBNS_FIXTURE = os.path.join(SCRIPTS_DIRECTORY, "fixtures", "isbns.txt")
+
+COLD_START_ENTRY_POINTS = {
+    "data_parser": "import data_parser",
+    "csv_data_processor": "import cloudsql.csv_data_processor",
+    "ol_dump_parser": (
+        "import sqlite3\n"
+        "from parsers.user_manager import UserManager\n"
+        "from parsers.ol_dump_parser import OLDumpParser\n"
+        "OLDumpParser(sqlite3.connect(':memory:'), 'csv', UserManager('csv'))"
+    ),
+    "ol_reads_rates_parser": (
+        "import sqlite3\n"
+        "from parsers.user_manager import UserManager\n"
+        "from parsers.ol_reads_rates_parser import OLRRParser\n"
+        "OLRRParser(sqlite3.connect(':memory:'), 'csv', UserManager('csv'), 'rating')"
+    ),
+    "sl_dump_parser": (
+        "import sqlite3\n"
+        "from parsers.user_manager import UserManager\n"
+        "from parsers.sl_dump_parser import SLDataParser\n"
+        "SLDataParser(sqlite3.connect(':memory:'), 'csv', UserManager('csv'))"
+    ),
+}
+
+
+def cold_start() -> None:
+    """
+    Measures the time every entry point needs to import and construct its
+    parsers in a fresh interpreter.
+
+    Returns:
+        None
+    """
+    for name, code in COLD_START_ENTRY_POINTS.items():
+        timed_code = (
+            "import time\n"
+            "start = time.perf_counter()\n"
+            f"{code}\n"
+            "print(time.perf_counter() - start)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", timed_code],
+            cwd=os.path.dirname(SCRIPTS_DIRECTORY),
+            env={**os.environ, "PYTHONPATH": SCRIPTS_DIRECTORY},
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            error = result.stderr.strip().splitlines()[-1]
+            print(f"{name}: failed ({error})", flush=True)
+        else:
+            print(f"{name}: {float(result.stdout.strip()):.3f}s", flush=True)
+
+
+def load_editions(count: int) -> list[dict]:
+    """
+    Loads the edition fixture, repeated up to the given number of editions.
+
+    Args:
+        count (int): The number of editions.
+
+    Returns:
+        list[dict]: The edition objects.
+    """
+    with open(EDITIONS_FIXTURE, "r", encoding="utf-8") as f:
+        editions = [jsonloads(line) for line in f]
+    return [editions[i % len(editions)] for i in range(count)]
+
+
+def language_detection(count: str = "20000") -> None:
+    """
+    Compares the titles per second of the per-title detection of all languages
+    with the language resolver and its batched detection.
+
+    Args:
+        count (str): The number of editions to resolve.
+
+    Returns:
+        None
+    """
+    from lingua import LanguageDetectorBuilder
+    from parsers.language_parser import LanguageParser
+    from parsers.language_resolver import LanguageResolver
+
+    editions = load_editions(int(count))
+    titles = [
+        ": ".join(filter(None, (obj.get("title"), obj.get("subtitle"))))
+        for obj in editions
+    ]
+
+    start = time.perf_counter()
+    detector = LanguageDetectorBuilder.from_all_languages().with_low_accuracy_mode().build()
+    legacy = []
+    for obj, title in zip(editions, titles):
+        if languages := obj.get("languages"):
+            legacy.append(LanguageResolver.map_language(languages[0]["key"].split("/")[-1]))
+        elif language := detector.detect_language_of(title):
+            legacy.append(LanguageResolver.map_language(language.iso_code_639_3.name.lower()))
+        else:
+            legacy.append(None)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resolver = LanguageResolver(LanguageParser.load_ids)
+    resolved = [resolver.resolve(obj, title) for obj, title in zip(editions, titles)]
+    undecided = [i for i, language in enumerate(resolved) if language is LanguageResolver.UNDECIDED]
+    for i, language in zip(undecided, resolver.detect([titles[i] for i in undecided])):
+        resolved[i] = language
+    resolver_seconds = time.perf_counter() - start
+
+    agreement = sum(a == b for a, b in zip(legacy, resolved)) / len(titles)
+    print(f"per-title detection: {len(titles) / legacy_seconds:,.0f} titles/s", flush=True)
+    print(f"language resolver: {len(titles) / resolver_seconds:,.0f} titles/s", flush=True)
+    print(
+        f"detected: {len(undecided)} of {len(titles)} titles, agreement {agreement:.1%}",
+        flush=True,
+    )
+
+
+def author_deduplication(count: str = "200000") -> None:
+    """
+    Checks the author deduplication on names that must and must not be merged,
+    and measures its authors per second on generated name variants.
+
+    Args:
+        count (str): The number of generated authors.
+
+    Returns:
+        None
+    """
+    from parsers.author_deduplicator import AuthorDeduplicator
+    import random
+
+    cases = [
+        ("Tolkien, J. R. R.", "J.R.R. Tolkien", True),
+        ("J. R. R. Tolkien", "John Ronald Reuel Tolkien", True),
+        ("Smith, John, Jr.", "John Smith", True),
+        ("Smith, John, ed.", "John Smith", True),
+        ("Dr. John Smith", "John Smith", True),
+        ("Smith, Ed", "Ed Smith", True),
+        ("Ed Smith", "Smith", False),
+        ("Dr. Smith", "Smith", False),
+        ("Prof Smith", "Smith", False),
+        ("Ed McBain", "McBain", False),
+        ("Ed Smith", "Dr. Smith", False),
+    ]
+    mismatches = []
+    for first, second, merged in cases:
+        canonical_ids = AuthorDeduplicator().deduplicate([(1, first), (2, second)])
+        if (canonical_ids[1] == canonical_ids[2]) != merged:
+            mismatches.append((first, second, merged))
+    print(f"checks: {len(cases) - len(mismatches)} of {len(cases)} as expected", flush=True)
+    for first, second, merged in mismatches:
+        print(f"  {'not merged' if merged else 'merged'}: {first!r}, {second!r}", flush=True)
+
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    given_names = ["".join(rng.choices(letters, k=6)).capitalize() for _ in range(2000)]
+    surnames = ["".join(rng.choices(letters, k=8)).capitalize() for _ in range(20000)]
+    authors = []
+    for author_id in range(1, int(count) + 1):
+        given, surname = rng.choice(given_names), rng.choice(surnames)
+        authors.append(
+            (
+                author_id,
+                rng.choice(
+                    (f"{given} {surname}", f"{surname}, {given}", f"{given[0]}. {surname}")
+                ),
+            )
+        )
+
+    start = time.perf_counter()
+    canonical_ids = AuthorDeduplicator().deduplicate(authors)
+    seconds = time.perf_counter() - start
+    merged = sum(author_id != canonical_id for author_id, canonical_id in canonical_ids.items())
+    print(f"deduplication: {len(authors) / seconds:,.0f} authors/s, {merged:,} merged", flush=True)
+
+
+def legacy_transliterate_to_ukrainian(text: str, publisher: bool = False) -> str:
+    """
+    The per-entry transliteration the dump parser used before the compiled
+    transliterator, kept as the reference for the parity check. Only the stray
+    backslash it wrote before apostrophes is fixed.
+
+    Args:
+        text (str): The text to be transliterated.
+        publisher (bool, optional): Whether the text is a publisher name. Defaults to False.
+
+    Returns:
+        str: The transliterated text.
+    """
+    from parsers.ukrainian_transliterator import UkrainianTransliterator
+    from transliterate import translit
+    import re
+
+    for original, replacement in UkrainianTransliterator.LETTERS_MAPPING.items():
+        text = text.replace(original, replacement)
+    text = translit(text, "uk")
+    if publisher:
+        text = (
+            text.replace("Вид-во", "")
+            .replace("Ізд-во", "")
+            .replace("Видавництво", "")
+            .replace("Вид.", "")
+            .replace("Ін-т", "Інститут")
+            .replace("ін-т", "інститут")
+        )
+    text = re.sub(
+        r"[^\w\s]",
+        "",
+        text.strip(UkrainianTransliterator.BRACELESS_PUNCTUATION_WITH_SPACE),
+    )
+    text = re.sub(r"([бпвмфгкхжчшрБПВМФГКХЖЧШР])ь", r"\1", text)
+    # The old template was r"\1\'\2", which wrote a backslash before the apostrophe.
+    text = re.sub(r"([бпвмфгкхжчшр])([яюєї])", r"\1'\2", text)
+    return text
+
+
+def transliteration(repeat: str = "200") -> None:
+    """
+    Checks the compiled transliterator against the per-entry one on the
+    Ukrainian title fixture, and compares their titles per second with the
+    fixture repeated the given number of times.
+
+    Args:
+        repeat (str): The number of times the fixture is transliterated.
+
+    Returns:
+        None
+    """
+    from parsers.ukrainian_transliterator import UkrainianTransliterator
+
+    with open(UKRAINIAN_TITLES_FIXTURE, "r", encoding="utf-8") as f:
+        titles = [line.rstrip("\n") for line in f if line.strip()]
+    inputs = [(title, publisher) for title in titles for publisher in (False, True)]
+
+    transliterator = UkrainianTransliterator()
+    mismatches = [
+        (title, publisher)
+        for title, publisher in inputs
+        if transliterator.transliterate(title, publisher)
+        != legacy_transliterate_to_ukrainian(title, publisher)
+    ]
+    print(f"parity: {len(inputs) - len(mismatches)} of {len(inputs)} identical", flush=True)
+    for title, publisher in mismatches:
+        print(f"  mismatch: {title!r} (publisher={publisher})", flush=True)
+
+    workload = inputs * int(repeat)
+    start = time.perf_counter()
+    for title, publisher in workload:
+        legacy_transliterate_to_ukrainian(title, publisher)
+    legacy_seconds = time.perf_counter() - start
+
+    transliterator = UkrainianTransliterator()
+    start = time.perf_counter()
+    for title, publisher in workload:
+        transliterator.transliterate(title, publisher)
+    cached_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for title, publisher in workload:
+        transliterator.transliterate.__wrapped__(title, publisher)
+    compiled_seconds = time.perf_counter() - start
+
+    print(f"per-entry replace: {len(workload) / legacy_seconds:,.0f} titles/s", flush=True)
+    print(f"compiled, uncached: {len(workload) / compiled_seconds:,.0f} titles/s", flush=True)
+    print(f"compiled, memoized: {len(workload) / cached_seconds:,.0f} titles/s", flush=True)
+
+
+def legacy_build_title(obj: dict) -> str:
+    """
+    The per-character title normalization the dump parser used before the
+    title normalizer, kept as the reference for the parity check.
+
+    Args:
+        obj (dict): The edition object.
+
+    Returns:
+        str: The normalized title.
+    """
+    from parsers.title_normalizer import TitleNormalizer
+    from html import unescape
+    from io import StringIO
+    import re
+
+    title = "{}. {}: {}".format(
+        obj.get("title_prefix", ""), obj.get("title", ""), obj.get("subtitle", "")
+    )
+    title = TitleNormalizer.REMOVALS_PATTERN.sub("", title)
+    title = unescape(title)
+    title = title.strip(TitleNormalizer.BRACELESS_PUNCTUATION_WITH_SPACE).replace('"', "'")
+
+    stack = []
+    matched_chars = StringIO()
+    for c in title:
+        if c in TitleNormalizer.OPENING_TO_CLOSING_PARENTHESES:
+            stack.append(c)
+        elif (
+            c in TitleNormalizer.CLOSING_TO_OPENING_PARENTHESES
+            and stack
+            and stack[-1] == TitleNormalizer.CLOSING_TO_OPENING_PARENTHESES[c]
+        ):
+            stack.pop()
+        elif not stack or stack[-1] != TitleNormalizer.CLOSING_TO_OPENING_PARENTHESES.get(c):
+            matched_chars.write(c)
+
+    title = re.sub(r"[{}]+\s*|\s+", " ", matched_chars.getvalue()).strip()
+    return title[:1].upper() + title[1:]
+
+
+def title_normalization(count: str = "200000") -> None:
+    """
+    Checks the title normalizer against the per-character normalization on the
+    edition fixture, and compares their titles per second with the fixture
+    repeated up to the given number of editions.
+
+    Args:
+        count (str): The number of editions to normalize.
+
+    Returns:
+        None
+    """
+    from parsers.title_normalizer import TitleNormalizer
+
+    with open(EDITIONS_FIXTURE, "r", encoding="utf-8") as f:
+        fixture = [jsonloads(line) for line in f]
+    mismatches = [
+        obj for obj in fixture if TitleNormalizer.build(obj) != legacy_build_title(obj)
+    ]
+    print(f"parity: {len(fixture) - len(mismatches)} of {len(fixture)} identical", flush=True)
+    for obj in mismatches:
+        print(f"  mismatch: {obj['key']}", flush=True)
+
+    editions = load_editions(int(count))
+    fast = sum(
+        not TitleNormalizer.SLOW_PATH_PATTERN.search(
+            "{}. {}: {}".format(
+                obj.get("title_prefix", ""), obj.get("title", ""), obj.get("subtitle", "")
+            )
+        )
+        for obj in fixture
+    )
+
+    start = time.perf_counter()
+    for obj in editions:
+        legacy_build_title(obj)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    TitleNormalizer.build_many(editions)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"fast path: {fast} of {len(fixture)} fixture titles", flush=True)
+    print(f"per-character: {len(editions) / legacy_seconds:,.0f} titles/s", flush=True)
+    print(f"title normalizer: {len(editions) / batch_seconds:,.0f} titles/s", flush=True)
+
+
+def legacy_find_year(s: str) -> int:
+    """
+    The year extraction the dump parser used before the field extractor, which
+    compiled its pattern on every call, kept as the reference for the parity check.
+
+    Args:
+        s (str): The input string to search for a year.
+
+    Returns:
+        int: The found year if it is less than or equal to the current year, otherwise 0.
+    """
+    import re
+
+    current_year = dt.now().year
+    pattern = re.compile(r"\b\d{4}\b")
+    for match in pattern.finditer(s):
+        year = int(match.group())
+        if year <= current_year:
+            return year
+    return 0
+
+
+def legacy_find_weight_in_kg(s: str) -> float:
+    """
+    The weight extraction the dump parser used before the field extractor, kept
+    as the reference for the parity check.
+
+    Args:
+        s (str): The input string.
+
+    Returns:
+        float: The weight in kilograms, rounded to 2 decimal places.
+            Returns None if the weight cannot be found.
+    """
+    import re
+
+    pattern = re.compile(r"\d+(\.\d+)?")
+
+    if result := list(pattern.finditer(s)):
+        if "k" in s:
+            conversion_factor = 1
+        elif "g" in s:
+            conversion_factor = 1 / 1000
+        elif "z" in s or "ounc" in s:
+            conversion_factor = 1 / 35.284
+        elif "lb" in s or "pound" in s:
+            conversion_factor = 1 / 2.205
+        else:
+            conversion_factor = 1
+
+        result = float(result[0].group()) * conversion_factor
+
+    return round(result, 2) if result else None
+
+
+def field_extraction(count: str = "1000000", chunk_size: str = "1000") -> None:
+    """
+    Checks the field extractor against the per-call extraction on the edition
+    field fixture, and compares their editions per second on the given number of
+    editions whose fields are drawn from the fixture with a skewed distribution.
+
+    Args:
+        count (str): The number of editions.
+        chunk_size (str): The number of editions resolved in a batch.
+
+    Returns:
+        None
+    """
+    from parsers.field_extractor import FieldExtractor
+    import json
+    import random
+
+    with open(EDITION_FIELDS_FIXTURE, "r", encoding="utf-8") as f:
+        fields = json.load(f)
+
+    extractor = FieldExtractor()
+    mismatches = [
+        value
+        for value in fields["publish_date"]
+        if extractor.year(value) != legacy_find_year(value)
+    ] + [
+        value
+        for value in fields["weight"]
+        if extractor.weight(value) != legacy_find_weight_in_kg(value)
+    ]
+    total = len(fields["publish_date"]) + len(fields["weight"])
+    print(f"parity: {total - len(mismatches)} of {total} identical", flush=True)
+    for value in mismatches:
+        print(f"  mismatch: {value!r}", flush=True)
+
+    rng = random.Random(0)
+    editions = [
+        {
+            field: values[min(int(rng.paretovariate(1.0)) - 1, len(values) - 1)]
+            for field, values in fields.items()
+        }
+        for _ in range(int(count))
+    ]
+
+    start = time.perf_counter()
+    for obj in editions:
+        legacy_find_year(obj["publish_date"])
+        legacy_find_weight_in_kg(obj["weight"])
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    extractor = FieldExtractor()
+    for i in range(0, len(editions), int(chunk_size)):
+        chunk = editions[i : i + int(chunk_size)]
+        extractor.resolve(chunk)
+        for obj in chunk:
+            extractor.year(obj["publish_date"])
+            extractor.weight(obj["weight"])
+            extractor.pages(obj["pagination"])
+    extractor_seconds = time.perf_counter() - start
+
+    hit_rates = ", ".join(f"{name} {rate:.1%}" for name, rate in extractor.hit_rates().items())
+    print(f"per-call extraction: {len(editions) / legacy_seconds:,.0f} editions/s", flush=True)
+    print(
+        f"field extractor (with pages): {len(editions) / extractor_seconds:,.0f} editions/s",
+        flush=True,
+    )
+    print(f"hit rates: {hit_rates}", flush=True)
+
+
+def legacy_convert_to_isbn13(isbns: list) -> list:
+    """
+    The ISBN conversion the parsers used before the ISBN normalizer, kept as
+    the baseline of the benchmark.
+
+    Args:
+        isbns (list): A list of ISBN-10s.
+
+    Returns:
+        list: A list of ISBN-13s.
+    """
+    import pyisbn
+
+    return [
+        (
+            pyisbn.Isbn(
+                "".join([char for char in isbn if char.isdigit() or char == "X"])
+            ).convert()
+            if len(isbn) == 10
+            else isbn
+        )
+        for isbn in isbns
+        if len(isbn) in [10, 13]
+    ]
+
+
+def pyisbn_isbn13(isbn: str) -> int:
+    """
+    Normalizes a raw ISBN with pyisbn, the reference for the parity check.
+
+    Args:
+        isbn (str): The raw ISBN.
+
+    Returns:
+        int: The ISBN-13, or 0 if pyisbn rejects the ISBN.
+    """
+    import pyisbn
+
+    clean = "".join(char for char in isbn if char in "0123456789Xx")
+    if len(clean) not in (10, 13):
+        return 0
+    try:
+        return int(pyisbn.convert(clean)) if len(clean) == 10 and pyisbn.validate(
+            clean
+        ) else int(clean) if pyisbn.validate(clean) else 0
+    except pyisbn.IsbnError:
+        return 0
+
+
+def isbn_normalization(count: str = "1000000", chunk_size: str = "1000") -> None:
+    """
+    Checks the ISBN normalizer against pyisbn on the ISBN fixture, and compares
+    the ISBNs per second of the per-ISBN conversion with the normalizer on the
+    fixture repeated up to the given number of ISBNs.
+
+    Args:
+        count (str): The number of ISBNs to convert.
+        chunk_size (str): The number of ISBNs resolved in a batch.
+
+    Returns:
+        None
+    """
+    from parsers.isbn_normalizer import IsbnNormalizer
+    import random
+
+    with open(ISBNS_FIXTURE, "r", encoding="utf-8") as f:
+        fixture = [line.rstrip("\n") for line in f]
+
+    normalized = IsbnNormalizer.normalize_many(fixture).tolist()
+    mismatches = [
+        (isbn, result)
+        for isbn, result in zip(fixture, normalized)
+        if result != pyisbn_isbn13(isbn)
+    ]
+    print(f"parity: {len(fixture) - len(mismatches)} of {len(fixture)} identical", flush=True)
+    for isbn, result in mismatches:
+        print(f"  mismatch: {isbn!r} -> {result}, pyisbn {pyisbn_isbn13(isbn)}", flush=True)
+    print(f"valid: {sum(map(bool, normalized))} of {len(fixture)}", flush=True)
+
+    rng = random.Random(0)
+    isbns = [fixture[rng.randrange(len(fixture))] for _ in range(int(count))]
+    chunks = [isbns[i : i + int(chunk_size)] for i in range(0, len(isbns), int(chunk_size))]
+
+    start = time.perf_counter()
+    for isbn in isbns:
+        try:
+            legacy_convert_to_isbn13([isbn])
+        except Exception:
+            continue
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for chunk in chunks:
+        IsbnNormalizer.normalize_many(chunk)
+    uncached_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    normalizer = IsbnNormalizer()
+    for chunk in chunks:
+        normalizer.resolve(chunk)
+        for isbn in chunk:
+            normalizer.convert([isbn])
+    cached_seconds = time.perf_counter() - start
+
+    print(f"per-ISBN pyisbn: {len(isbns) / legacy_seconds:,.0f} ISBNs/s", flush=True)
+    print(f"vectorized, uncached: {len(isbns) / uncached_seconds:,.0f} ISBNs/s", flush=True)
+    print(f"vectorized, cached: {len(isbns) / cached_seconds:,.0f} ISBNs/s", flush=True)
+
+
+def enrichment_cache(count: str = "20000") -> None:
+    """
+    Compares a cold run of the language detection, which fills a new
+    enrichment cache, with a warm run on the same titles that reads it back.
+
+    Args:
+        count (str): The number of titles to detect, drawn from the edition
+            fixture with a numeric suffix so that they are distinct.
+
+    Returns:
+        None
+    """
+    from parsers.enrichment_cache import EnrichmentCache
+    from parsers.language_parser import LanguageParser
+    from parsers.language_resolver import LanguageResolver
+    import tempfile
+
+    titles = [f"{obj.get('title')} {i}" for i, obj in enumerate(load_editions(int(count)))]
+    resolver = LanguageResolver(LanguageParser.load_ids)
+    resolver.detect(titles[:1])
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, EnrichmentCache.DEFAULT_PATH)
+        for run in ("cold", "warm"):
+            cache = EnrichmentCache(path)
+            start = time.perf_counter()
+            cache.cached("language", resolver.version, titles, resolver.detect)
+            seconds = time.perf_counter() - start
+            hits, misses = cache.stats()["language"]
+            cache.close()
+            print(
+                f"{run} run: {len(titles) / seconds:,.0f} titles/s, "
+                f"{hits:,} hits, {misses:,} misses",
+                flush=True,
+            )
+
+
+def legacy_parse_reading_log(
+    input_file: str, output_file: str, work_ids: dict[str, int], user_manager
+) -> None:
+    """
+    The line-by-line reading log parsing of the OL reads and rates parser before
+    its columnar ingestion, kept as the baseline of the benchmark.
+
+    Args:
+        input_file (str): The path to the reading log.
+        output_file (str): The path to the output file.
+        work_ids (dict[str, int]): A dictionary mapping the OL keys of the
+            selected works to their IDs.
+        user_manager (UserManager): The user manager generating the readers.
+
+    Returns:
+        None
+    """
+    from parsers.ol_abstract_parser import OLAbstractParser
+    from parsers.ol_reads_rates_parser import ReadingStatus
+    import itertools
+    import csv
+
+    ids = itertools.count(1)
+    with open(input_file, "r", encoding="utf-8") as f_in, open(
+        output_file, "w", encoding="utf-8", newline=""
+    ) as f_out:
+        writer = csv.writer(f_out, quoting=csv.QUOTE_ALL)
+        while lines := list(itertools.islice(f_in, 1000)):
+            rows = []
+            for line in lines:
+                fields = line.split("\t")
+                shift = 1 if len(fields) == 4 else 0
+                if not (work_id := work_ids.get(fields[0].split("/")[-1])):
+                    continue
+                field = ReadingStatus(fields[1 + shift]).name
+                date = f"{fields[2 + shift].strip()}T{OLAbstractParser.get_random_time()}"
+                rows.append(
+                    (next(ids), user_manager.get_or_generate_reader(), work_id, field, date)
+                )
+            writer.writerows(rows)
+
+
+def write_reading_log(path: str, count: int, works: int) -> None:
+    """
+    Generates a reading log dump with a mix of 4-field and 3-field lines.
+
+    Args:
+        path (str): The path of the reading log.
+        count (int): The number of lines.
+        works (int): The number of distinct works.
+
+    Returns:
+        None
+    """
+    from parsers.ol_reads_rates_parser import ReadingStatus
+    import random
+
+    rng = random.Random(0)
+    statuses = [status.value for status in ReadingStatus]
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(count):
+            work = rng.randint(1, works)
+            edition = f"/books/OL{work}M" if rng.random() < 0.8 else ""
+            date = f"20{rng.randint(10, 23)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}"
+            f.write(f"/works/OL{work}W\t{edition}\t{rng.choice(statuses)}\t{date}\n")
+
+
+def reading_log_ingestion(count: str = "1000000", works: str = "50000") -> None:
+    """
+    Compares the rows per second of the line-by-line and the columnar reading
+    log ingestion on a generated reading log.
+
+    Args:
+        count (str): The number of reading log lines.
+        works (str): The number of distinct works, half of which are selected.
+
+    Returns:
+        None
+    """
+    from parsers.ol_reads_rates_parser import OLRRParser
+    from parsers.user_manager import UserManager
+    import tempfile
+    import sqlite3
+    import csv
+
+    work_ids = {f"OL{i}W": i for i in range(1, int(works) + 1, 2)}
+
+    with tempfile.TemporaryDirectory(dir=".") as directory:
+        input_file = os.path.join(directory, "ol_dump_reading-log_2024-01-01.txt")
+        write_reading_log(input_file, int(count), int(works))
+
+        start = time.perf_counter()
+        legacy_parse_reading_log(
+            input_file, os.path.join(directory, "legacy.csv"), work_ids, UserManager("csv")
+        )
+        legacy_seconds = time.perf_counter() - start
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE work_id (work_id INTEGER PRIMARY KEY)")
+        conn.executemany("INSERT INTO work_id VALUES (?)", [(i,) for i in work_ids.values()])
+        parser = OLRRParser(conn, "csv", UserManager("csv"), "listing")
+        parser._OLRRParser__mapped_work_ids = work_ids
+        start = time.perf_counter()
+        parser.process_file(input_file, os.path.join(directory, "columnar.csv"))
+        columnar_seconds = time.perf_counter() - start
+
+        outputs = []
+        for name in ("legacy.csv", "columnar.csv"):
+            with open(os.path.join(directory, name), encoding="utf-8", newline="") as f:
+                outputs.append(
+                    [(id, work_id, status, date[:11]) for id, _, work_id, status, date in csv.reader(f)]
+                )
+        identical = outputs[0] == outputs[1]
+
+    print(f"line by line: {int(count) / legacy_seconds:,.0f} rows/s", flush=True)
+    print(f"columnar: {int(count) / columnar_seconds:,.0f} rows/s", flush=True)
+    print(f"same ids, works, statuses and dates: {identical}", flush=True)
+
+
+def legacy_random_birthday(start_year: int = 1960, end_year: int = dt.now().year - 6) -> str:
+    """
+    The per-user birthday of the user manager before the bulk user generation,
+    kept as part of the baseline of the benchmark.
+
+    Args:
+        start_year (int): The earliest birth year.
+        end_year (int): The latest birth year.
+
+    Returns:
+        str: The birthday as an ISO date string.
+    """
+    from datetime import timedelta
+    import random
+
+    rand_year = random.random()
+    if rand_year < 0.8:
+        year = random.randint(start_year + 15, end_year - 11)
+    elif rand_year < 0.9:
+        year = random.randint(start_year, start_year + 14)
+    else:
+        year = random.randint(end_year - 10, end_year)
+    day = random.randint(1, 365)
+    return (dt(year, 1, 1) + timedelta(days=day)).date().isoformat()
+
+
+def legacy_fill_user(fake, emails: set[str], user_id: int) -> tuple:
+    """
+    The per-user generation of the user manager before the bulk user
+    generator, kept as the baseline of the benchmark.
+
+    Args:
+        fake (Faker): The Faker instance.
+        emails (set[str]): The emails generated so far.
+        user_id (int): The ID of the user.
+
+    Returns:
+        tuple: The user row.
+    """
+    import random
+
+    gender = random.choices(["male", "female", "non-binary"], weights=[4, 4, 1], k=1)[0]
+    if gender == "male":
+        first_name, last_name = fake.first_name_male(), fake.last_name_male()
+    elif gender == "female":
+        first_name, last_name = fake.first_name_female(), fake.last_name_female()
+    else:
+        first_name, last_name = fake.first_name(), fake.last_name()
+
+    email = f"{first_name}_{last_name}@knyhozbirnia.com"
+    index = 0
+    while email in emails:
+        email = f"{first_name}_{last_name}{index}@knyhozbirnia.com"
+        index += 1
+    emails.add(email)
+
+    return (
+        user_id,
+        first_name,
+        last_name,
+        gender[0],
+        email,
+        legacy_random_birthday(),
+        "USER",
+        dt.now().isoformat(),
+    )
+
+
+def user_generation(count: str = "200000") -> None:
+    """
+    Compares the users per second of the per-user and the bulk user generation,
+    and checks the uniqueness of the emails and the shares of the genders.
+
+    Args:
+        count (str): The number of users.
+
+    Returns:
+        None
+    """
+    from parsers.user_generator import UserGenerator
+    from collections import Counter
+    from faker import Faker
+
+    fake = Faker()
+    user_ids = list(range(1, int(count) + 1))
+
+    emails = set()
+    start = time.perf_counter()
+    legacy = [legacy_fill_user(fake, emails, user_id) for user_id in user_ids]
+    legacy_seconds = time.perf_counter() - start
+
+    generator = UserGenerator(fake, seed=0)
+    start = time.perf_counter()
+    bulk = [user for users in generator.generate_chunks(user_ids) for user in users]
+    bulk_seconds = time.perf_counter() - start
+
+    print(f"per user: {int(count) / legacy_seconds:,.0f} users/s", flush=True)
+    print(f"bulk: {int(count) / bulk_seconds:,.0f} users/s", flush=True)
+    for name, users in (("per user", legacy), ("bulk", bulk)):
+        genders = Counter(user[3] for user in users)
+        years = [int(user[5][:4]) for user in users]
+        print(
+            f"{name}: unique emails {len({user[4] for user in users}) == len(users)}, "
+            f"genders {', '.join(f'{g} {n / len(users):.3f}' for g, n in sorted(genders.items()))}, "
+            f"birth years {min(years)}-{max(years)} (mean {sum(years) / len(years):.1f})",
+            flush=True,
+        )
+
+
+def legacy_get_or_generate_readers(count: int) -> list[int]:
+    """
+    The per-event reader assignment of the user manager before the batched
+    activity model, kept as the baseline of the benchmark.
+
+    Args:
+        count (int): The number of events.
+
+    Returns:
+        list[int]: The user ID of every event.
+    """
+    import itertools
+    import random
+
+    users = []
+    user_ids = itertools.count(1)
+    readers = []
+    for _ in range(count):
+        if not users or random.random() < 20000 / len(users) / random.randint(1, 500):
+            users.append(next(user_ids))
+            readers.append(users[-1])
+        else:
+            readers.append(random.choice(users))
+    return readers
+
+
+def reader_assignment(count: str = "5000000", batch_size: str = "10000") -> None:
+    """
+    Compares the events per second of the per-event and the batched reader
+    assignment, and the number of users and the share of the events of the most
+    active 1% of the users they produce.
+
+    Args:
+        count (str): The number of events.
+        batch_size (str): The number of events per batch.
+
+    Returns:
+        None
+    """
+    from parsers.user_manager import UserManager
+    import numpy as np
+
+    start = time.perf_counter()
+    legacy = np.array(legacy_get_or_generate_readers(int(count)))
+    legacy_seconds = time.perf_counter() - start
+
+    user_manager = UserManager("csv", seed=0)
+    start = time.perf_counter()
+    batched = np.concatenate(
+        [
+            user_manager.get_or_generate_readers(min(int(batch_size), int(count) - done))
+            for done in range(0, int(count), int(batch_size))
+        ]
+    )
+    batched_seconds = time.perf_counter() - start
+
+    print(f"per event: {int(count) / legacy_seconds:,.0f} events/s", flush=True)
+    print(f"batched: {int(count) / batched_seconds:,.0f} events/s", flush=True)
+    for name, readers in (("per event", legacy), ("batched", batched)):
+        events = np.sort(np.bincount(readers))[::-1]
+        users = int((events > 0).sum())
+        print(
+            f"{name}: {users:,} users, top 1% of users have "
+            f"{events[: max(users // 100, 1)].sum() / len(readers):.1%} of the events",
+            flush=True,
+        )
+
+
+def item_assignment(items: str = "200", loans: str = "6000") -> None:
+    """
+    Compares the loans per second of the shuffled and the scheduled assignment
+    of the loans of a single work to its items, and the share of the loans
+    assigned to an item still on loan.
+
+    Args:
+        items (str): The number of items of the work.
+        loans (str): The number of loans, spread over a year in seconds.
+
+    Returns:
+        None
+    """
+    from parsers.item_scheduler import ItemScheduler
+    import random
+
+    rng = random.Random(0)
+    loan_times = sorted(rng.randint(0, 365 * 24 * 3600) for _ in range(int(loans)))
+    periods = [
+        (loaned_at, loaned_at + rng.randint(1, 14) * 24 * 3600 + rng.randint(0, 23) * 3600)
+        for loaned_at in loan_times
+    ]
+    item_ids = list(range(1, int(items) + 1))
+
+    def count_conflicts(assigned: list[int]) -> int:
+        free_at = {}
+        conflicts = 0
+        for (loaned_at, returned_at), item_id in zip(periods, assigned):
+            conflicts += free_at.get(item_id, loaned_at) > loaned_at
+            free_at[item_id] = returned_at
+        return conflicts
+
+    start = time.perf_counter()
+    shuffled = []
+    for i in range(len(periods)):
+        rng.shuffle(item_ids)
+        shuffled.append(item_ids[i % len(item_ids)])
+    shuffled_seconds = time.perf_counter() - start
+
+    scheduler = ItemScheduler(range(1, int(items) + 1))
+    start = time.perf_counter()
+    scheduled = [scheduler.assign(loaned_at, returned_at) for loaned_at, returned_at in periods]
+    scheduled_seconds = time.perf_counter() - start
+
+    for name, assigned, seconds in (
+        ("shuffled", shuffled, shuffled_seconds),
+        ("scheduled", scheduled, scheduled_seconds),
+    ):
+        print(
+            f"{name}: {len(periods) / seconds:,.0f} loans/s, "
+            f"{count_conflicts(assigned) / len(periods):.1%} on items on loan",
+            flush=True,
+        )
+
+
+def legacy_synthesize_timestamps(groups: list[tuple[int, int, int]]) -> list[tuple]:
+    """
+    The per-loan timestamp synthesis of the SL parser before its vectorized
+    synthesis, kept as the baseline of the benchmark.
+
+    Args:
+        groups (list[tuple[int, int, int]]): The year, month and number of
+            checkouts of every group.
+
+    Returns:
+        list[tuple]: The ISO loan time and the ISO return time or None of every loan.
+    """
+    from datetime import timedelta
+    import calendar
+    import random
+
+    rows = []
+    for year, month, checkouts in groups:
+        for _ in range(checkouts):
+            loaned_at = dt(
+                year,
+                month,
+                random.randint(1, calendar.monthrange(year, month)[1]),
+                random.randint(0, 23),
+                random.randint(0, 59),
+                random.randint(0, 59),
+                random.randint(0, 999999),
+            )
+            returned_at = None
+            if random.randint(0, 100_000) != 99_999:
+                returned_at = (
+                    loaned_at
+                    + timedelta(
+                        days=random.randint(1, 14),
+                        hours=random.randint(0, 23),
+                        minutes=random.randint(0, 59),
+                    )
+                ).isoformat()
+            rows.append((loaned_at.isoformat(), returned_at))
+    return rows
+
+
+def loan_timestamps(groups: str = "200000") -> None:
+    """
+    Compares the rows per second of the per-loan and the vectorized synthesis
+    and formatting of loan and return times on generated checkout groups.
+
+    Args:
+        groups (str): The number of (work, year, month) checkout groups.
+
+    Returns:
+        None
+    """
+    from parsers.sl_dump_parser import SLDataParser
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    years = rng.integers(2005, 2024, int(groups), endpoint=True)
+    months = rng.integers(1, 12, int(groups), endpoint=True)
+    checkouts = rng.zipf(1.8, int(groups)).clip(1, 500)
+    rows = int(checkouts.sum())
+
+    start = time.perf_counter()
+    legacy = legacy_synthesize_timestamps(
+        list(zip(years.tolist(), months.tolist(), checkouts.tolist()))
+    )
+    legacy_seconds = time.perf_counter() - start
+
+    not_returned = 0
+    start = time.perf_counter()
+    for batch in range(0, int(groups), SLDataParser.GROUP_BATCH_SIZE):
+        window = slice(batch, batch + SLDataParser.GROUP_BATCH_SIZE)
+        group, loaned_at, returned_at, returned = SLDataParser.synthesize_timestamps(
+            years[window], months[window], checkouts[window], rng
+        )
+        loaned = np.datetime_as_string(loaned_at, unit="us").tolist()
+        returns = np.datetime_as_string(returned_at[returned], unit="us").tolist()
+        not_returned += len(loaned) - len(returns)
+    vectorized_seconds = time.perf_counter() - start
+
+    print(f"per loan: {rows / legacy_seconds:,.0f} rows/s", flush=True)
+    print(f"vectorized: {rows / vectorized_seconds:,.0f} rows/s", flush=True)
+    print(
+        f"not returned of {rows:,}: per loan {sum(row[1] is None for row in legacy):,}, "
+        f"vectorized {not_returned:,}",
+        flush=True,
+    )
+
+
+def checkout_state(rows: str = "1000000", works: str = "100000") -> None:
+    """
+    Compares the peak memory and the rows per second of keeping the matched
+    checkout rows of the SL parser as dictionaries and as columnar arrays.
+
+    Args:
+        rows (str): The number of matched checkout rows.
+        works (str): The number of distinct works.
+
+    Returns:
+        None
+    """
+    from parsers.sl_dump_parser import SLDataParser
+    from parsers.user_manager import UserManager
+    import tracemalloc
+    import sqlite3
+    import random
+
+    rng = random.Random(0)
+    materials = ["BOOK"] * 8 + ["EBOOK", "AUDIOBOOK"]
+    checkouts = [
+        (rng.randint(1, int(works)), rng.randint(2005, 2024), rng.randint(1, 12),
+         rng.randint(1, 30), rng.choice(materials))
+        for _ in range(int(rows))
+    ]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    loans = []
+    items_maxxing = {}
+    for work_id, year, month, count, material_type in checkouts:
+        loans.append(
+            {"checkout_year": year, "checkout_month": month, "checkouts": count, "work_id": work_id}
+        )
+        items_maxxing[work_id] = {
+            "qty": (
+                max(items_maxxing.get(work_id, {}).get("qty", 0), count)
+                if material_type == "BOOK"
+                else 1
+            ),
+            "material_type": material_type,
+        }
+    legacy_seconds = time.perf_counter() - start
+    legacy_peak = tracemalloc.get_traced_memory()[1]
+    del loans, items_maxxing
+    tracemalloc.stop()
+
+    parser = SLDataParser(sqlite3.connect(":memory:"), "csv", UserManager("csv"))
+    parser._SLDataParser__work_isbns = {work_id: work_id for work_id in range(1, int(works) + 1)}
+    parser.convert_to_isbn13 = lambda isbns: isbns
+    lines = [
+        {"isbn": work_id, "checkoutyear": year, "checkoutmonth": month, "checkouts": count,
+         "materialtype": material_type}
+        for work_id, year, month, count, material_type in checkouts
+    ]
+    parser._SLDataParser__split_isbns = lambda line: [line["isbn"]]
+    parse_line = parser._SLDataParser__parse_line
+    tracemalloc.start()
+    start = time.perf_counter()
+    for line in lines:
+        parse_line(line)
+    parser._SLDataParser__aggregate_items()
+    columnar_seconds = time.perf_counter() - start
+    columnar_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(
+        f"dictionaries: {int(rows) / legacy_seconds:,.0f} rows/s, "
+        f"peak {legacy_peak / 2**20:,.1f} MiB",
+        flush=True,
+    )
+    print(
+        f"columnar: {int(rows) / columnar_seconds:,.0f} rows/s, "
+        f"peak {columnar_peak / 2**20:,.1f} MiB",
+        flush=True,
+    )
+
+
+def legacy_write_csv(file, obj: dict) -> None:
+    """
+    The per-row dictionary writing of the file writer before the table sinks,
+    kept as the baseline of the benchmark.
+
+    Args:
+        file (TextIOWrapper): The output file.
+        obj (dict): The row.
+
+    Returns:
+        None
+    """
+    import csv
+
+    writer = csv.DictWriter(file, fieldnames=obj.keys(), quoting=csv.QUOTE_ALL)
+    writer.writerow(obj)
+
+
+def table_sink(count: str = "1000000") -> None:
+    """
+    Compares the rows per second of the per-row dictionary writer and the
+    buffered CSV table sink on generated work rows.
+
+    Args:
+        count (str): The number of rows.
+
+    Returns:
+        None
+    """
+    from parsers.table_sink import TABLE_SCHEMAS, CsvSink
+    import tempfile
+    import filecmp
+    import random
+
+    rng = random.Random(0)
+    modified_at = dt.now().isoformat()
+    rows = [
+        (i, rng.randint(1, 5000), 9780000000000 + i, "eng", f"Title {rng.random()}",
+         rng.randint(50, 900), round(rng.random() * 2, 2), rng.randint(1900, 2024), modified_at)
+        for i in range(1, int(count) + 1)
+    ]
+    columns = [name for name, _ in TABLE_SCHEMAS["work"]]
+    objs = [dict(zip(columns, row)) for row in rows]
+
+    with tempfile.TemporaryDirectory(dir=".") as directory:
+        legacy_path = os.path.join(directory, "legacy.csv")
+        sink_path = os.path.join(directory, "sink.csv")
+
+        start = time.perf_counter()
+        with open(legacy_path, "w", encoding="utf-8", newline="") as f:
+            for obj in objs:
+                legacy_write_csv(f, obj)
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with CsvSink(sink_path, "work") as sink:
+            for row in rows:
+                sink.append(row)
+        sink_seconds = time.perf_counter() - start
+
+        identical = filecmp.cmp(legacy_path, sink_path, shallow=False)
+
+    print(f"per-row DictWriter: {int(count) / legacy_seconds:,.0f} rows/s", flush=True)
+    print(f"CSV table sink: {int(count) / sink_seconds:,.0f} rows/s", flush=True)
+    print(f"identical output: {identical}", flush=True)
+
+
+def parquet_output(count: str = "1000000") -> None:
+    """
+    Compares the size and the write and read times of the CSV and the Parquet
+    outputs of generated work and loan tables.
+
+    Args:
+        count (str): The number of rows of every table.
+
+    Returns:
+        None
+    """
+    from parsers.table_sink import CsvSink, ParquetSink
+    import pyarrow.parquet as pq
+    import pandas as pd
+    import numpy as np
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    ids = range(1, int(count) + 1)
+    modified_at = dt.now().isoformat()
+    loaned_at = np.datetime_as_string(
+        np.datetime64("2015-01-01T00:00:00", "us")
+        + rng.integers(0, 9 * 365 * 86_400_000_000, int(count)).astype("timedelta64[us]"),
+        unit="us",
+    ).tolist()
+    tables = {
+        "work": list(
+            zip(
+                ids,
+                rng.integers(1, 5000, int(count)).tolist(),
+                (9780000000000 + np.arange(int(count))).tolist(),
+                rng.choice(["eng", "ukr", "ger", None], int(count)).tolist(),
+                [f"Title {i}" for i in ids],
+                rng.integers(50, 900, int(count)).tolist(),
+                rng.random(int(count)).round(2).tolist(),
+                rng.integers(1900, 2024, int(count)).tolist(),
+                [modified_at] * int(count),
+            )
+        ),
+        "loan": list(
+            zip(
+                ids,
+                rng.integers(1, 50_000, int(count)).tolist(),
+                rng.integers(1, 200_000, int(count)).tolist(),
+                loaned_at,
+            )
+        ),
+    }
+
+    with tempfile.TemporaryDirectory(dir=".") as directory:
+        for table, rows in tables.items():
+            for sink_type, read in (
+                (CsvSink, lambda path: pd.read_csv(path, header=None)),
+                (ParquetSink, lambda path: pq.read_table(path).to_pandas()),
+            ):
+                path = os.path.join(directory, f"{table}.{sink_type.__name__}")
+                start = time.perf_counter()
+                with sink_type(path, table) as sink:
+                    sink.extend(rows)
+                write_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                read(path)
+                read_seconds = time.perf_counter() - start
+                print(
+                    f"{table} {sink_type.__name__}: {os.path.getsize(path) / 2**20:,.1f} MiB, "
+                    f"write {write_seconds:.2f} s, read {read_seconds:.2f} s",
+                    flush=True,
+                )
+
+
+def write_behind(count: str = "1000000", groups: str = "100000", file_type: str = "csv") -> None:
+    """
+    Compares the wall time of the reading log and the Seattle loan stages
+    with synchronous and write-behind output sinks.
+
+    Args:
+        count (str): The number of reading log lines.
+        groups (str): The number of Seattle checkout groups.
+        file_type (str): The output file type.
+
+    Returns:
+        None
+    """
+    from parsers.ol_reads_rates_parser import OLRRParser
+    from parsers.sl_dump_parser import SLDataParser
+    from parsers.user_manager import UserManager
+    import tempfile
+    import sqlite3
+    import random
+
+    works = 50_000
+    work_ids = {f"OL{i}W": i for i in range(1, works + 1, 2)}
+    rng = random.Random(0)
+    checkouts = [
+        {
+            "isbn": rng.randint(1, works),
+            "checkoutyear": rng.randint(2005, 2024),
+            "checkoutmonth": rng.randint(1, 12),
+            "checkouts": rng.randint(1, 30),
+            "materialtype": rng.choice(["BOOK"] * 8 + ["EBOOK", "AUDIOBOOK"]),
+        }
+        for _ in range(int(groups))
+    ]
+
+    with tempfile.TemporaryDirectory(dir=".") as directory:
+        input_file = os.path.join(directory, "ol_dump_reading-log_2024-01-01.txt")
+        write_reading_log(input_file, int(count), works)
+
+        for write_behind in (False, True):
+            conn = sqlite3.connect(":memory:")
+            conn.execute("CREATE TABLE work_id (work_id INTEGER PRIMARY KEY)")
+            conn.executemany("INSERT INTO work_id VALUES (?)", [(i,) for i in work_ids.values()])
+            parser = OLRRParser(conn, file_type, UserManager(file_type, seed=0), "listing")
+            parser._OLRRParser__mapped_work_ids = work_ids
+            parser.write_behind = write_behind
+            start = time.perf_counter()
+            parser.process_file(input_file, os.path.join(directory, f"listing.{file_type}"))
+            reading_log_seconds = time.perf_counter() - start
+
+            parser = SLDataParser(
+                sqlite3.connect(":memory:"), file_type, UserManager(file_type, seed=0)
+            )
+            parser._SLDataParser__work_isbns = {i: i for i in range(1, works + 1)}
+            parser.convert_to_isbn13 = lambda isbns: isbns
+            parser._SLDataParser__split_isbns = lambda line: [line["isbn"]]
+            for line in checkouts:
+                parser._SLDataParser__parse_line(line)
+            parser.write_behind = write_behind
+            start = time.perf_counter()
+            with parser.open_sink(
+                os.path.join(directory, f"inventory_item.{file_type}"), "inventory_item"
+            ) as item_out, parser.open_sink(
+                os.path.join(directory, f"loan.{file_type}"), "loan"
+            ) as loan_out, parser.open_sink(
+                os.path.join(directory, f"loan_return.{file_type}"), "loan_return"
+            ) as return_out:
+                parser.process_data(item_out, loan_out, return_out)
+            seattle_seconds = time.perf_counter() - start
+
+            mode = "write-behind" if write_behind else "synchronous"
+            print(
+                f"{mode}: reading log {reading_log_seconds:.2f} s, "
+                f"Seattle loans {seattle_seconds:.2f} s",
+                flush=True,
+            )
+
+
+def gzip_output(count: str = "1000000", levels: str = "1,6,9") -> None:
+    """
+    Compares the size and the write and read times of the plain and the
+    gzip-compressed CSV outputs of a generated loan table, for every level.
+
+    Args:
+        count (str): The number of rows.
+        levels (str): The comma-separated gzip compression levels.
+
+    Returns:
+        None
+    """
+    from parsers.table_sink import CsvSink, GzipCsvSink
+    import numpy as np
+    import tempfile
+    import gzip
+
+    rng = np.random.default_rng(0)
+    loaned_at = np.datetime_as_string(
+        np.datetime64("2015-01-01T00:00:00", "us")
+        + rng.integers(0, 9 * 365 * 86_400_000_000, int(count)).astype("timedelta64[us]"),
+        unit="us",
+    ).tolist()
+    rows = list(
+        zip(
+            range(1, int(count) + 1),
+            rng.integers(1, 50_000, int(count)).tolist(),
+            rng.integers(1, 200_000, int(count)).tolist(),
+            loaned_at,
+        )
+    )
+
+    with tempfile.TemporaryDirectory(dir=".") as directory:
+        for level in [None, *map(int, levels.split(","))]:
+            path = os.path.join(directory, "loan.csv" if level is None else f"loan.{level}.csv.gz")
+            start = time.perf_counter()
+            if level is None:
+                with CsvSink(path, "loan") as sink:
+                    sink.extend(rows)
+            else:
+                with GzipCsvSink(path, "loan", compression_level=level) as sink:
+                    sink.extend(rows)
+            write_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with (open if level is None else gzip.open)(path, "rb") as f:
+                while f.read(1 << 20):
+                    pass
+            read_seconds = time.perf_counter() - start
+            print(
+                f"{'plain' if level is None else f'gzip level {level}'}: "
+                f"{os.path.getsize(path) / 2**20:,.1f} MiB, "
+                f"write {write_seconds:.2f} s, read {read_seconds:.2f} s",
+                flush=True,
+            )
+
+
+def sharded_output(count: str = "1000000", shard_bytes: str = "8388608") -> None:
+    """
+    Compares writing a generated loan table to a single CSV file and to
+    size-rotated shards with a manifest, and checks that the shards hold the
+    same rows.
+
+    Args:
+        count (str): The number of rows.
+        shard_bytes (str): The size after which a shard is rotated.
+
+    Returns:
+        None
+    """
+    from parsers.sharded_sink import ShardedSink
+    from parsers.table_sink import CsvSink
+    import numpy as np
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    loaned_at = np.datetime_as_string(
+        np.datetime64("2015-01-01T00:00:00", "us")
+        + rng.integers(0, 9 * 365 * 86_400_000_000, int(count)).astype("timedelta64[us]"),
+        unit="us",
+    ).tolist()
+    rows = list(
+        zip(
+            range(1, int(count) + 1),
+            rng.integers(1, 50_000, int(count)).tolist(),
+            rng.integers(1, 200_000, int(count)).tolist(),
+            loaned_at,
+        )
+    )
+
+    with tempfile.TemporaryDirectory(dir=".") as directory:
+        single_path = os.path.join(directory, "single", "loan.csv")
+        sharded_path = os.path.join(directory, "sharded", "loan.csv")
+        os.makedirs(os.path.dirname(single_path))
+        os.makedirs(os.path.dirname(sharded_path))
+
+        start = time.perf_counter()
+        with CsvSink(single_path, "loan") as sink:
+            sink.extend(rows)
+        single_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ShardedSink(
+            lambda path: CsvSink(path, "loan"), sharded_path, "loan", max_bytes=int(shard_bytes)
+        ) as sink:
+            sink.extend(rows)
+        sharded_seconds = time.perf_counter() - start
+
+        shards = ShardedSink.read_shards(sharded_path)
+        with open(single_path, "rb") as f:
+            single = f.read()
+        joined = b"".join(open(shard["path"], "rb").read() for shard in shards)
+        checksums = all(ShardedSink.md5(shard["path"]) == shard["md5"] for shard in shards)
+
+    sizes = [shard["bytes"] / 2**20 for shard in shards]
+    print(f"single file: {len(single) / 2**20:,.1f} MiB, write {single_seconds:.2f} s", flush=True)
+    print(
+        f"{len(shards)} shards of {min(sizes):,.1f} to {max(sizes):,.1f} MiB: "
+        f"write and checksum {sharded_seconds:.2f} s",
+        flush=True,
+    )
+    print(
+        f"manifest rows: {sum(shard['rows'] for shard in shards):,}, "
+        f"identical rows: {joined == single}, checksums match: {checksums}",
+        flush=True,
+    )
+
+
+def sorted_output(count: str = "2000000", max_rows_in_memory: str = "500000") -> None:
+    """
+    Compares writing a generated work_subject table in set order and ordered by
+    its primary key, in memory and with an external sort, and the time SQLite
+    takes to load each file into a table with that primary key and to build an
+    index on subject_id, as a local stand-in for the index builds of Cloud SQL.
+
+    Args:
+        count (str): The number of rows.
+        max_rows_in_memory (str): The number of rows per run of the external sort.
+
+    Returns:
+        None
+    """
+    from parsers.sorted_sink import SortedSink
+    from parsers.table_sink import CsvSink
+    import numpy as np
+    import tempfile
+    import filecmp
+    import sqlite3
+    import csv
+
+    rng = np.random.default_rng(0)
+    pairs = set(
+        zip(
+            rng.integers(1, int(count) // 4, int(count)).tolist(),
+            rng.integers(1, 5000, int(count)).tolist(),
+        )
+    )
+    rows = list(pairs)
+
+    with tempfile.TemporaryDirectory(dir=".") as directory:
+        variants = {
+            "set order": lambda path: CsvSink(path, "work_subject"),
+            "sorted in memory": lambda path: SortedSink(CsvSink(path, "work_subject")),
+            "sorted externally": lambda path: SortedSink(
+                CsvSink(path, "work_subject"), max_rows_in_memory=int(max_rows_in_memory)
+            ),
+        }
+        paths = {}
+        for name, open_sink in variants.items():
+            paths[name] = os.path.join(directory, f"{name.replace(' ', '_')}.csv")
+            start = time.perf_counter()
+            with open_sink(paths[name]) as sink:
+                sink.extend(rows)
+            runs = f", {sink.runs} runs" if isinstance(sink, SortedSink) else ""
+            print(
+                f"{name}: write {time.perf_counter() - start:.2f} s{runs}", flush=True
+            )
+        identical = filecmp.cmp(
+            paths["sorted in memory"], paths["sorted externally"], shallow=False
+        )
+        print(f"identical sorted outputs: {identical}", flush=True)
+
+        for name in ("set order", "sorted in memory"):
+            conn = sqlite3.connect(os.path.join(directory, f"{name.replace(' ', '_')}.db"))
+            conn.execute("PRAGMA cache_size = -16000")
+            conn.execute(
+                "CREATE TABLE work_subject (work_id INTEGER, subject_id INTEGER, "
+                "PRIMARY KEY (work_id, subject_id))"
+            )
+            with open(paths[name], encoding="utf-8", newline="") as f:
+                loaded = [(int(work_id), int(subject_id)) for work_id, subject_id in csv.reader(f)]
+            start = time.perf_counter()
+            conn.executemany("INSERT INTO work_subject VALUES (?, ?)", loaded)
+            conn.commit()
+            load_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            conn.execute("CREATE INDEX idx_work_subject_subject ON work_subject (subject_id)")
+            conn.commit()
+            index_seconds = time.perf_counter() - start
+            conn.close()
+            print(
+                f"SQLite {name}: load with primary key {load_seconds:.2f} s, "
+                f"subject_id index {index_seconds:.2f} s",
+                flush=True,
+            )
+
+
+BENCHMARKS = {
+    "cold_start": cold_start,
+    "language_detection": language_detection,
+    "author_deduplication": author_deduplication,
+    "transliteration": transliteration,
+    "title_normalization": title_normalization,
+    "field_extraction": field_extraction,
+    "isbn_normalization": isbn_normalization,
+    "enrichment_cache": enrichment_cache,
+    "reading_log_ingestion": reading_log_ingestion,
+    "user_generation": user_generation,
+    "reader_assignment": reader_assignment,
+    "item_assignment": item_assignment,
+    "loan_timestamps": loan_timestamps,
+    "checkout_state": checkout_state,
+    "table_sink": table_sink,
+    "parquet_output": parquet_output,
+    "write_behind": write_behind,
+    "gzip_output": gzip_output,
+    "sharded_output": sharded_output,
+    "sorted_output": sorted_output,
+}
+
+
+def main() -> None:
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print(f"Usage: python {sys.argv[0]} {{{','.join(BENCHMARKS)}}} [args...]")
+        sys.exit(1)
+
+    print(f"Benchmark '{sys.argv[1]}' started - {dt.now().isoformat()}", flush=True)
+    BENCHMARKS[sys.argv[1]](*sys.argv[2:])
+    print(f"Benchmark '{sys.argv[1]}' finished - {dt.now().isoformat()}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
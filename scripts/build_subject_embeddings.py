@@ -0,0 +1,75 @@
+"""
+Builds the compact subject embedding store from the full fastText model.
+
+Run from the repository root, e.g.
+`python scripts/build_subject_embeddings.py "open library dump/ol_dump_2024-04-30.txt" --dim 100 --check`.
+"""
+from parsers.embedding_store import EmbeddingStore
+from parsers.subject_classifier import SubjectClassifier
+from parsers.ol_dump_parser import OLDumpParser
+from parsers.user_manager import UserManager
+
+from datetime import datetime as dt
+import numpy as np
+import argparse
+import sqlite3
+import time
+import os
+
+
+def check_accuracy(full_model, path: str, texts: list[str]) -> None:
+    """
+    Reports how many subject assignments change when the compact store is used
+    instead of the full model.
+
+    Args:
+        full_model (FastText._FastText): The full fastText model.
+        path (str): The path of the artifact without extension.
+        texts (list[str]): The distinct preprocessed subjects.
+
+    Returns:
+        None
+    """
+    start = time.perf_counter()
+    store = EmbeddingStore(path)
+    print(f"Store loaded in {time.perf_counter() - start:.3f}s", flush=True)
+
+    np.random.seed(0)
+    full = SubjectClassifier(lambda: full_model).classify(texts)
+    np.random.seed(0)
+    compact = SubjectClassifier(lambda: store).classify(texts)
+
+    changed = int((full != compact).sum())
+    print(
+        f"Changed assignments: {changed} of {len(texts)} "
+        f"({100 * changed / max(len(texts), 1):.2f}%)",
+        flush=True,
+    )
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("dump", help="Open Library dump file to take the subjects from")
+    arguments.add_argument("--output", default=EmbeddingStore.DEFAULT_PATH)
+    arguments.add_argument("--dim", type=int, default=None)
+    arguments.add_argument("--check", action="store_true")
+    args = arguments.parse_args()
+
+    print(f"Collecting subjects - {dt.now().isoformat()}", flush=True)
+    parser = OLDumpParser(sqlite3.connect(":memory:"), "csv", UserManager("csv"))
+    texts = sorted(set(parser.subject_texts(args.dump)))
+
+    print(f"Building store of {len(texts)} subjects - {dt.now().isoformat()}", flush=True)
+    classifier = SubjectClassifier(lambda: parser.ft)
+    EmbeddingStore.build(parser.ft, texts + classifier.themes, args.output, args.dim)
+    print(
+        f"Store size: {os.path.getsize(f'{args.output}.npy') + os.path.getsize(f'{args.output}.json')} bytes",
+        flush=True,
+    )
+
+    if args.check:
+        check_accuracy(parser.ft, args.output, texts)
+
+
+if __name__ == "__main__":
+    main()
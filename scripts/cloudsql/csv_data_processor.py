@@ -1,22 +1,68 @@
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from regex import E
 from parsers.data_processor import DataProcessor
-
-from google.cloud.sql.connector import Connector
-from googleapiclient import discovery, errors
-from google.oauth2 import service_account
-from google.cloud import storage, bigquery
-
-import sqlalchemy
+from parsers.sharded_sink import ShardedSink
 
 import db_secrets as secrets
+import base64
+import re
 import time
 
+if TYPE_CHECKING:
+    from google.cloud.sql.connector import Connector
+    import sqlalchemy
+
 
 class CSVDataprocessor(DataProcessor):
-    def __init__(self):
-        super().__init__("csv")
+    MAX_ATTEMPTS = 3
+    RETRY_SECONDS = 10
+    POLL_SECONDS = 5
+    MAX_POLL_ATTEMPTS = 10
+    SLOWEST_STATEMENTS = 15
+    SQL_TOKEN_PATTERN = re.compile(r"\$\$.*?\$\$|'[^']*'|--[^\n]*|;|[^;$'-]+|.", re.S)
+
+    def __init__(
+        self,
+        file_type: str = "csv",
+        compression_level: int | None = None,
+        shard_rows: int | None = None,
+        shard_bytes: int | None = None,
+        sort_output: bool = False,
+        write_behind: bool = False,
+    ):
+        """
+        Initializes a CSVDataprocessor object.
+
+        Args:
+            file_type (str): The type of the outputs, 'csv' to import them into
+                Cloud SQL or 'parquet' to only write them.
+            compression_level (int | None): The gzip level of the CSV outputs,
+                which are then uploaded and imported compressed, or None to
+                write plain CSV files.
+            shard_rows (int | None): The number of rows after which an output is
+                rotated to a new shard, or None.
+            shard_bytes (int | None): The size after which an output is rotated
+                to a new shard, or None.
+            sort_output (bool): Whether the tables emitted out of key order are
+                written ordered by their primary key, so that the imported heaps
+                are clustered by it.
+            write_behind (bool): Whether the output blocks are written on
+                write-behind threads.
+
+        Returns:
+            None
+        """
+        if file_type != "csv" and compression_level is not None:
+            raise ValueError(
+                f"The compression level only applies to CSV outputs, not '{file_type}'"
+            )
+
+        super().__init__(file_type if compression_level is None else "csv.gz")
+        self.set_compression_level(compression_level)
+        self.set_shard_limits(shard_rows, shard_bytes)
+        self.set_sort_output(sort_output)
+        self.set_write_behind(write_behind)
 
         self.CREDENTIALS = r"scripts\cloudsql\credentials.json"
 
@@ -24,7 +70,7 @@ class CSVDataprocessor(DataProcessor):
             f"{secrets.PROJECT_ID}:{secrets.REGION}:{secrets.INSTANCE_ID}"
         )
         
-        self.blobs = []
+        self.blobs = {}
 
     def run(
         self, old_directory=r"open library dump", sld_directory=r"seattle library dump"
@@ -74,6 +120,23 @@ class CSVDataprocessor(DataProcessor):
         self.sqlite_conn.close()
         self.user_manager.write_users()
 
+        # Cloud SQL only imports CSV files, the Parquet outputs are left on disk.
+        if self.type_name == "parquet":
+            print(
+                f"Wrote {len(files)} Parquet outputs, skipping the Cloud SQL import "
+                f"- {datetime.now().isoformat()}",
+                flush=True,
+            )
+            return
+
+        # The Google Cloud SDK and SQLAlchemy are only needed for the upload,
+        # so they are imported here rather than at startup.
+        from google.cloud.sql.connector import Connector
+        from googleapiclient import discovery
+        from google.oauth2 import service_account
+        from google.cloud import storage
+        import sqlalchemy
+
         service_credentials = service_account.Credentials.from_service_account_file(
             self.CREDENTIALS
         )
@@ -92,55 +155,54 @@ class CSVDataprocessor(DataProcessor):
 
         storage_client = storage.Client.from_service_account_json(self.CREDENTIALS)
         bucket = storage_client.get_bucket(secrets.BUCKET_NAME)
-        for file in files:
-            filename = file.split("\\")[-1]
-
-            blob = bucket.blob(filename)
-            self.blobs.append(blob)
-
-            with open(file, "rb") as f:
-                blob.upload_from_file(f)
-            table_name = filename.split(".")[0]
-
-            file_uri = f"gs://{secrets.BUCKET_NAME}/{filename}"
-
-            import_request_body = {
-                "importContext": {
-                    "fileType": "CSV",
-                    "uri": file_uri,
-                    "database": secrets.DB_NAME,
-                    "csvImportOptions": {
-                        "table": table_name,
-                        "escapeCharacter": "5C",  # ASCII hexadecimal for backslash
-                        "quoteCharacter": "22",  # ASCII hexadecimal for double quote
-                        "fieldDelimiter": "2C",  # ASCII hexadecimal for comma
-                    },
-                    "api_key": secrets.CLOUD_SQL_API_KEY,
-                }
-            }
-
-            while True:
+        shards = [shard for file in files for shard in ShardedSink.read_shards(file)]
+        uploaded_bytes = sum(shard["bytes"] for shard in shards)
+        upload_seconds = import_seconds = 0.0
+        pending = shards
+        for attempt in range(1, CSVDataprocessor.MAX_ATTEMPTS + 1):
+            failed = []
+            for shard in pending:
                 try:
-                    request = service.instances().import_(
-                        project=secrets.PROJECT_ID,
-                        instance=secrets.INSTANCE_ID,
-                        body=import_request_body,
-                    )
-
-                    response = request.execute()
+                    upload_seconds += self.__upload_shard(bucket, shard)
+                    start = time.perf_counter()
+                    operation = self.__start_import(service, shard)
+                except Exception as e:
+                    print(f"Importing {shard['path']} failed: {e}", flush=True)
+                    failed.append(shard)
+                    continue
+
+                # Only a failure reported by the import itself is retried, a shard
+                # whose import went through is never imported twice.
+                operation = self.__wait_for_operation(service, operation)
+                import_seconds += time.perf_counter() - start
+                if "error" in operation:
+                    print(f"Importing {shard['path']} failed: {operation['error']}", flush=True)
+                    failed.append(shard)
+                else:
+                    print(f'importing from {operation.get("importContext").get("uri") } to the table {operation.get("importContext").get("csvImportOptions").get("table")} is {operation.get("status")}', flush=True)
+            if not (pending := failed) or attempt == CSVDataprocessor.MAX_ATTEMPTS:
+                break
+            print(
+                f"Retrying {len(pending)} of {len(shards)} shards, attempt {attempt + 1} "
+                f"- {datetime.now().isoformat()}",
+                flush=True,
+            )
+            time.sleep(CSVDataprocessor.RETRY_SECONDS)
+        if pending:
+            raise RuntimeError(
+                f"Could not import {', '.join(shard['path'] for shard in pending)}"
+            )
 
-                    print(f'importing from {response.get("importContext").get("uri") } to the table {response.get("importContext").get("csvImportOptions").get("table")} is {response.get("status")}', flush=True)
-                    break
-                except errors.HttpError as e:
-                    if (e.resp.status == 409):  # If the error is 'operationInProgress'
-                        print("Operation in progress, waiting...", flush=True)
-                        time.sleep(10)
-                    else:
-                        continue
+        print(
+            f"Uploaded {len(shards)} shards, {uploaded_bytes / 2**20:,.1f} MiB, "
+            f"in {upload_seconds:.1f} s, importing took {import_seconds:.1f} s "
+            f"- {datetime.now().isoformat()}",
+            flush=True,
+        )
         print(f"Adding indices and constraints - {datetime.now().isoformat()}", flush=True)
         while True:
             try:
-                self.execute_script(pool, "scripts/sql/database_after_process.sql")
+                self.execute_script(pool, "scripts/sql/database_after_process.sql", timed=True)
                 break
             except sqlalchemy.exc.DatabaseError as e:
                 if e.orig.args[0].get('R') == 'DeadLockReport':
@@ -153,9 +215,108 @@ class CSVDataprocessor(DataProcessor):
                 time.sleep(10)
         self.perform_cleanup(bucket, service_credentials)
 
+    def __upload_shard(self, bucket, shard: dict) -> float:
+        """
+        Uploads a shard to the bucket, verified against its MD5 checksum.
+
+        Args:
+            bucket: The bucket the shard is uploaded to.
+            shard (dict): The path, size and MD5 checksum of the shard.
+
+        Returns:
+            float: The upload time in seconds.
+        """
+        filename = shard["path"].split("\\")[-1]
+
+        start = time.perf_counter()
+        blob = bucket.blob(filename)
+        blob.md5_hash = base64.b64encode(bytes.fromhex(shard["md5"])).decode()
+        with open(shard["path"], "rb") as f:
+            # Compressed objects are stored as is, Cloud SQL decompresses '.gz' imports.
+            blob.upload_from_file(
+                f, content_type="application/gzip" if filename.endswith(".gz") else "text/csv"
+            )
+        self.blobs[filename] = blob
+        return time.perf_counter() - start
+
+    def __start_import(self, service, shard: dict) -> dict:
+        """
+        Starts the import of an uploaded shard into the table named by its file
+        name, waiting while another operation is in progress.
+
+        Args:
+            service: The Cloud SQL Admin API service.
+            shard (dict): The path of the shard.
+
+        Returns:
+            dict: The import operation.
+        """
+        from googleapiclient import errors
+
+        filename = shard["path"].split("\\")[-1]
+        table_name = filename.split(".")[0]
+        file_uri = f"gs://{secrets.BUCKET_NAME}/{filename}"
+
+        import_request_body = {
+            "importContext": {
+                "fileType": "CSV",
+                "uri": file_uri,
+                "database": secrets.DB_NAME,
+                "csvImportOptions": {
+                    "table": table_name,
+                    "escapeCharacter": "5C",  # ASCII hexadecimal for backslash
+                    "quoteCharacter": "22",  # ASCII hexadecimal for double quote
+                    "fieldDelimiter": "2C",  # ASCII hexadecimal for comma
+                },
+                "api_key": secrets.CLOUD_SQL_API_KEY,
+            }
+        }
+
+        while True:
+            try:
+                request = service.instances().import_(
+                    project=secrets.PROJECT_ID,
+                    instance=secrets.INSTANCE_ID,
+                    body=import_request_body,
+                )
+
+                return request.execute()
+            except errors.HttpError as e:
+                if (e.resp.status == 409):  # If the error is 'operationInProgress'
+                    print("Operation in progress, waiting...", flush=True)
+                    time.sleep(10)
+                else:
+                    raise
+
+    def __wait_for_operation(self, service, operation: dict) -> dict:
+        """
+        Polls an operation until it is done, retrying the failed polls.
+
+        Args:
+            service: The Cloud SQL Admin API service.
+            operation (dict): The operation.
+
+        Returns:
+            dict: The finished operation, with an 'error' if it failed.
+        """
+        failed_polls = 0
+        while operation.get("status") != "DONE":
+            time.sleep(CSVDataprocessor.POLL_SECONDS)
+            try:
+                operation = service.operations().get(
+                    project=secrets.PROJECT_ID, operation=operation["name"]
+                ).execute()
+                failed_polls = 0
+            except Exception as e:
+                failed_polls += 1
+                if failed_polls >= CSVDataprocessor.MAX_POLL_ATTEMPTS:
+                    raise
+                print(f"Polling {operation['name']} failed, retrying: {e}", flush=True)
+        return operation
+
     def create_conn(
-        self, sql_connector: Connector
-    ) -> sqlalchemy.engine.base.Connection:
+        self, sql_connector: "Connector"
+    ) -> "sqlalchemy.engine.base.Connection":
         """
         Establishes a connection to the database.
 
@@ -173,27 +334,102 @@ class CSVDataprocessor(DataProcessor):
             db=secrets.DB_NAME,
         )
 
-    def execute_script(self, pool, script_path: str) -> None:
+    def execute_script(self, pool, script_path: str, timed: bool = False) -> None:
         """
         Executes a SQL script on the database.
 
         Args:
             pool: The connection pool to the database.
             script_path: The path to the SQL script to be executed.
+            timed: Whether the statements are executed one by one, in the same
+                transaction, and their times are printed.
 
         Returns:
             None
         """
+        import sqlalchemy
+
+        script = open(script_path, "r", encoding="utf-8").read()
         with pool.connect() as db_conn:
-            db_conn.execute(
-                sqlalchemy.text(open(script_path, "r", encoding="utf-8").read())
-            )
+            if not timed:
+                db_conn.execute(sqlalchemy.text(script))
+            else:
+                timings = []
+                for statement in self.split_statements(script):
+                    start = time.perf_counter()
+                    db_conn.execute(sqlalchemy.text(statement))
+                    timings.append((time.perf_counter() - start, statement))
+                self.__print_timings(script_path, timings)
             db_conn.commit()
             db_conn.close()
 
+    @staticmethod
+    def split_statements(script: str) -> list[str]:
+        """
+        Splits a SQL script into its statements, keeping the semicolons within
+        quotes, dollar-quoted function bodies and comments.
+
+        Args:
+            script (str): The SQL script.
+
+        Returns:
+            list[str]: The statements, without their semicolons.
+        """
+        statements, tokens = [], []
+        for token in CSVDataprocessor.SQL_TOKEN_PATTERN.findall(script):
+            if token != ";":
+                tokens.append(token)
+            elif statement := "".join(tokens).strip():
+                statements.append(statement)
+                tokens = []
+        if statement := "".join(tokens).strip():
+            statements.append(statement)
+        return [
+            statement
+            for statement in statements
+            if any(not line.lstrip().startswith("--") for line in statement.splitlines())
+        ]
+
+    @staticmethod
+    def __print_timings(script_path: str, timings: list[tuple[float, str]]) -> None:
+        """
+        Prints the total time of a script, the time spent building indices and
+        the slowest statements.
+
+        Args:
+            script_path (str): The path to the SQL script.
+            timings (list[tuple[float, str]]): The time and text of every statement.
+
+        Returns:
+            None
+        """
+        def label(statement: str) -> str:
+            return next(
+                line.strip()
+                for line in statement.splitlines()
+                if line.strip() and not line.lstrip().startswith("--")
+            )
+
+        indices = sum(
+            seconds
+            for seconds, statement in timings
+            if label(statement).upper().startswith(("CREATE INDEX", "CREATE UNIQUE INDEX"))
+        )
+        print(
+            f"{script_path} took {sum(seconds for seconds, _ in timings):.1f} s, "
+            f"building indices {indices:.1f} s - {datetime.now().isoformat()}",
+            flush=True,
+        )
+        for seconds, statement in sorted(timings, key=lambda timing: timing[0], reverse=True)[
+            : CSVDataprocessor.SLOWEST_STATEMENTS
+        ]:
+            print(f"{seconds:8.2f} s  {label(statement)[:100]}", flush=True)
+
     def perform_cleanup(self, bucket, credentials):
+        from google.cloud import storage, bigquery
+
         print(f"Cleaning up the bucket - {datetime.now().isoformat()}", flush=True)
-        for blob in self.blobs:
+        for blob in self.blobs.values():
             blob.delete()
         
         print(f"Cleaning up the OLAP database - {datetime.now().isoformat()}", flush=True)
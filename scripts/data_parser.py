@@ -1,11 +1,68 @@
 from cloudsql.csv_data_processor import CSVDataprocessor
 from datetime import datetime as dt
+import argparse
 import cProfile
 import pstats
 
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses the command line options of the optional output modes.
+
+    Returns:
+        argparse.Namespace: The options.
+    """
+    parser = argparse.ArgumentParser(description="Parses the dumps and loads them into Cloud SQL.")
+    parser.add_argument(
+        "--file-type",
+        choices=("csv", "parquet"),
+        default="csv",
+        help="the type of the output files, Parquet outputs are written but not imported",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        choices=range(1, 10),
+        metavar="{1-9}",
+        help="write gzip-compressed CSV files at this level and import them compressed",
+    )
+    parser.add_argument(
+        "--shard-rows",
+        type=int,
+        help="rotate every output table to a new shard after this many rows",
+    )
+    parser.add_argument(
+        "--shard-mib",
+        type=int,
+        help="rotate every output table to a new shard after about this many MiB",
+    )
+    parser.add_argument(
+        "--sort-output",
+        action="store_true",
+        help="write the tables emitted out of key order sorted by their primary key",
+    )
+    parser.add_argument(
+        "--write-behind",
+        action="store_true",
+        help="write the output blocks on separate threads while parsing",
+    )
+    args = parser.parse_args()
+    if args.file_type != "csv" and args.compression_level is not None:
+        parser.error("--compression-level only applies to --file-type csv")
+    return args
+
+
 def main():
+    args = parse_args()
     print(f"Script execution started - {dt.now().isoformat()}", flush=True)
-    CSVDataprocessor().run()
+    CSVDataprocessor(
+        file_type=args.file_type,
+        compression_level=args.compression_level,
+        shard_rows=args.shard_rows,
+        shard_bytes=args.shard_mib and args.shard_mib * 2**20,
+        sort_output=args.sort_output,
+        write_behind=args.write_behind,
+    ).run()
     print(f"Script execution finished - {dt.now().isoformat()}", flush=True)
 
 
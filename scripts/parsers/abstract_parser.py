@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
 import os
 import sqlite3
-import pyisbn
 
+from parsers.isbn_normalizer import IsbnNormalizer
 from parsers.user_manager import UserManager
 
 
@@ -13,6 +13,7 @@ class AbstractParser(ABC):
         self.user_manager = user_manager
         self.conn = conn
         self.cursor = self.conn.cursor()
+        self.isbn_normalizer = IsbnNormalizer()
 
     @abstractmethod
     def process_file(self, input_file: str, output: str) -> str:
@@ -37,28 +38,17 @@ class AbstractParser(ABC):
         """
         return os.path.abspath(".") in os.path.abspath(path)
 
-    @staticmethod
-    def convert_to_isbn13(isbns: list) -> list:
+    def convert_to_isbn13(self, isbns: list) -> list:
         """
-        Convert a list of ISBN-10s to ISBN-13s.
+        Convert a list of ISBN-10s and ISBN-13s to ISBN-13s.
 
         Args:
-            l (list): A list of ISBN-10s.
+            isbns (list): A list of raw ISBNs.
 
         Returns:
-            list: A list of ISBN-13s.
+            list: A list of the ISBN-13s of the valid ISBNs, as integers.
         """
-        return [
-            (
-                pyisbn.Isbn(
-                    "".join([char for char in isbn if char.isdigit() or char == "X"])
-                ).convert()
-                if len(isbn) == 10
-                else isbn
-            )
-            for isbn in isbns
-            if len(isbn) in [10, 13]
-        ]
+        return self.isbn_normalizer.convert(isbns)
 
     @staticmethod
     def capitalize_first(s: str) -> str:
@@ -0,0 +1,108 @@
+from parsers.table_sink import TableSink
+
+import threading
+import queue
+import time
+
+
+class AsyncSink(TableSink):
+    """
+    Writes the blocks of another sink on a write-behind thread.
+
+    Flushed blocks are handed to a bounded queue instead of being written on
+    the parsing thread, which carries on while a worker thread formats and
+    writes them. When the queue is full the parser waits, so the memory held
+    by pending blocks stays bounded. Closing the sink waits for the pending
+    blocks to be written and closes the wrapped sink. An error of the worker
+    is raised on the parsing thread by the next flush or by `close`.
+
+    Formatting rows holds the GIL, so the parser only gains while the worker
+    waits on the disk, e.g. on slow or network drives.
+
+    Attributes:
+        sink (TableSink): The wrapped sink.
+        write_seconds (float): The time the worker spent writing blocks.
+        wait_seconds (float): The time the parser spent waiting for a free slot.
+    """
+
+    MAX_PENDING_BLOCKS = 4
+
+    def __init__(self, sink: TableSink, max_pending_blocks: int = MAX_PENDING_BLOCKS) -> None:
+        """
+        Initializes an AsyncSink object and starts its worker thread.
+
+        Args:
+            sink (TableSink): The sink whose blocks are written by the worker.
+            max_pending_blocks (int): The number of blocks queued before the
+                parser waits.
+
+        Returns:
+            None
+        """
+        TableSink.__init__(self, sink.path, sink.table)
+        self.sink = sink
+        self.schema = sink.schema
+        self.write_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.__error: BaseException | None = None
+        self.__queue: queue.Queue[list[tuple] | None] = queue.Queue(max_pending_blocks)
+        self.__worker = threading.Thread(
+            target=self.__write_pending, name=f"{sink.table}-writer", daemon=True
+        )
+        self.__worker.start()
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns the time the worker spent writing and the time the parser spent
+        waiting for it, whose difference bounds the time overlapped with parsing.
+
+        Returns:
+            dict[str, float]: The write, wait and at most overlapped seconds.
+        """
+        return {
+            "write": self.write_seconds,
+            "wait": self.wait_seconds,
+            "overlap": max(self.write_seconds - self.wait_seconds, 0.0),
+        }
+
+    def _write_block(self, rows: list[tuple]) -> None:
+        self.__raise_error()
+        start = time.perf_counter()
+        self.__queue.put(rows)
+        self.wait_seconds += time.perf_counter() - start
+
+    def _close(self) -> None:
+        start = time.perf_counter()
+        self.__queue.put(None)
+        self.__worker.join()
+        self.wait_seconds += time.perf_counter() - start
+        self.sink.close()
+        self.__raise_error()
+
+    def __write_pending(self) -> None:
+        """
+        Writes the queued blocks until the end of the queue is reached.
+
+        Returns:
+            None
+        """
+        while (rows := self.__queue.get()) is not None:
+            if self.__error is not None:
+                continue
+            start = time.perf_counter()
+            try:
+                self.sink._write_block(rows)
+                self.sink.rows += len(rows)
+            except BaseException as e:
+                self.__error = e
+            self.write_seconds += time.perf_counter() - start
+
+    def __raise_error(self) -> None:
+        """
+        Raises the error of the worker thread, if any.
+
+        Returns:
+            None
+        """
+        if self.__error is not None:
+            raise self.__error
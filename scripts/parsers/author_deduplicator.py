@@ -0,0 +1,171 @@
+from collections import defaultdict
+from typing import Iterable
+from unicodedata import combining, normalize
+
+import re
+
+
+class AuthorDeduplicator:
+    """
+    Merges the authors whose names differ only by order, initials, punctuation
+    or diacritics, e.g. 'Tolkien, J. R. R.', 'J.R.R. Tolkien' and
+    'John Ronald Reuel Tolkien'.
+
+    Every name is normalized to lowercase 'given names surname' tokens without
+    diacritics, and identical normalized names are merged right away. The
+    remaining names are blocked by their surname and the initials of their
+    given names, and inside a block a name with initials is merged into the
+    single fuller name it is compatible with. A name compatible with several
+    fuller names is ambiguous and kept apart. Blocks are small, so the pass is
+    near-linear in the number of authors.
+
+    Attributes:
+        __parents (dict[int, int]): The union-find parent of every author ID.
+    """
+
+    SUFFIXES = frozenset(("jr", "sr", "ii", "iii", "iv", "phd", "md", "esq"))
+    HONORIFICS = frozenset(("dr", "prof"))
+    EDITOR_PATTERN = re.compile(r"\s*(?:eds?\.|editors?)\s*")
+    PARENTHESES_PATTERN = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+    NON_LETTER_PATTERN = re.compile(r"[\W\d_]+")
+
+    def __init__(self) -> None:
+        self.__parents: dict[int, int] = {}
+
+    @staticmethod
+    def tokens(name: str) -> tuple[str, ...]:
+        """
+        Normalizes an author name to its tokens in 'given names surname' order.
+
+        Suffixes are only dropped where they can't be part of the name: as
+        trailing comma parts, e.g. 'Smith, John, Jr.' or 'Smith, John, ed.', or
+        as the last token, e.g. 'John Smith Jr'. An editor designation has to
+        be written as 'ed.', 'eds.' or 'editor', so 'Smith, Ed' stays 'Ed Smith'.
+        An honorific is dropped only before a given name and a surname, so
+        'Dr. John Smith' is 'John Smith' but 'Dr. Smith' is not 'Smith'.
+
+        Args:
+            name (str): The author name.
+
+        Returns:
+            tuple[str, ...]: The lowercase tokens without diacritics, punctuation,
+                dates, suffixes and honorifics.
+        """
+        name = "".join(
+            c for c in normalize("NFKD", name) if not combining(c)
+        ).lower()
+        name = AuthorDeduplicator.PARENTHESES_PATTERN.sub(" ", name)
+
+        parts = [
+            (part, tokens)
+            for part in name.split(",")
+            if (tokens := AuthorDeduplicator.NON_LETTER_PATTERN.sub(" ", part).split())
+        ]
+        while len(parts) > 1 and (
+            all(token in AuthorDeduplicator.SUFFIXES for token in parts[-1][1])
+            or AuthorDeduplicator.EDITOR_PATTERN.fullmatch(parts[-1][0])
+        ):
+            parts.pop()
+        if len(parts) == 2:
+            parts.reverse()
+
+        tokens = [token for _, part_tokens in parts for token in part_tokens]
+        while len(tokens) > 1 and tokens[-1] in AuthorDeduplicator.SUFFIXES:
+            tokens.pop()
+        if len(tokens) > 2 and tokens[0] in AuthorDeduplicator.HONORIFICS:
+            del tokens[0]
+        return tuple(tokens)
+
+    @staticmethod
+    def compatible(first: tuple[str, ...], second: tuple[str, ...]) -> bool:
+        """
+        Checks whether two normalized names can belong to the same author, i.e.
+        their tokens match pairwise, a single letter matching any token that
+        starts with it.
+
+        Args:
+            first (tuple[str, ...]): The tokens of the first name.
+            second (tuple[str, ...]): The tokens of the second name.
+
+        Returns:
+            bool: True if the names are compatible, False otherwise.
+        """
+        return len(first) == len(second) and all(
+            a == b or (len(a) == 1 and b[0] == a) or (len(b) == 1 and a[0] == b)
+            for a, b in zip(first, second)
+        )
+
+    def deduplicate(self, authors: Iterable[tuple[int, str]]) -> dict[int, int]:
+        """
+        Deduplicates the given authors.
+
+        Args:
+            authors (Iterable[tuple[int, str]]): The author IDs and names.
+
+        Returns:
+            dict[int, int]: A dictionary mapping every author ID to the ID of the
+                author it is merged into. Every group of duplicates is merged into
+                the author with the fullest name, and the lowest ID among those.
+        """
+        forms: dict[tuple[str, ...], int] = {}
+        self.__parents = {}
+        for author_id, name in sorted(authors):
+            self.__parents[author_id] = author_id
+            if not (tokens := self.tokens(name)):
+                continue
+            if (form_id := forms.setdefault(tokens, author_id)) != author_id:
+                self.__parents[author_id] = form_id
+
+        blocks: dict[tuple[str, ...], list[tuple[str, ...]]] = defaultdict(list)
+        for tokens in forms:
+            if len(tokens) > 1:
+                blocks[(tokens[-1], *(token[0] for token in tokens[:-1]))].append(tokens)
+
+        for block in blocks.values():
+            if len(block) < 2:
+                continue
+            block.sort(key=self.__initial_count)
+            for index, tokens in enumerate(block):
+                if not (initials := self.__initial_count(tokens)):
+                    continue
+                roots = {
+                    self.__find(forms[fuller])
+                    for fuller in block[:index]
+                    if self.__initial_count(fuller) < initials
+                    and self.compatible(tokens, fuller)
+                }
+                if len(roots) == 1:
+                    self.__parents[forms[tokens]] = roots.pop()
+
+        return {author_id: self.__find(author_id) for author_id in self.__parents}
+
+    @staticmethod
+    def __initial_count(tokens: tuple[str, ...]) -> int:
+        """
+        Counts the initials of a normalized name.
+
+        Args:
+            tokens (tuple[str, ...]): The tokens of the name.
+
+        Returns:
+            int: The number of single-letter tokens.
+        """
+        return sum(len(token) == 1 for token in tokens)
+
+    def __find(self, author_id: int) -> int:
+        """
+        Finds the ID an author is merged into, compressing the path to it.
+
+        Args:
+            author_id (int): The author ID.
+
+        Returns:
+            int: The ID of the author it is merged into.
+        """
+        root = author_id
+        while (parent := self.__parents[root]) != root:
+            root = parent
+        while (parent := self.__parents[author_id]) != root:
+            self.__parents[author_id] = root
+            author_id = parent
+        return root
@@ -12,6 +12,7 @@ import requests
 import gzip
 
 from parsers.user_manager import UserManager
+from parsers.file_writer import FileWriter
 
 
 class DataProcessor(ABC):
@@ -38,6 +39,14 @@ class DataProcessor(ABC):
         unarchive_file(archive_path: str, unarchive_path: str) -> str:
             Unarchives a gzip compressed file.
         delete_file(*path: str) -> None: Deletes the specified files.
+        set_write_behind(self, enabled) -> None:
+            Makes every writer write its output blocks on a write-behind thread.
+        set_compression_level(self, level) -> None:
+            Sets the compression level of the compressed outputs of every writer.
+        set_shard_limits(self, rows, size) -> None:
+            Rotates the outputs of every writer into shards.
+        set_sort_output(self, enabled) -> None:
+            Makes every writer emit its tables ordered by their primary key.
         download_and_unarchive_datasets(self) -> None:
             Downloads and unarchives the datasets.
     """
@@ -68,7 +77,7 @@ class DataProcessor(ABC):
         self.sl_parser = sldumpp.SLDataParser(
             self.sqlite_conn, file_type, self.user_manager
         )
-        self.language_parser = lp.LanguageParser()
+        self.language_parser = lp.LanguageParser(file_type)
         self.ol_files = {
             "https://openlibrary.org/data/ol_dump_latest.txt.gz": "open library dump/ol_dump_latest.txt.gz",
             "https://openlibrary.org/data/ol_dump_ratings_latest.txt.gz": "open library dump/ol_dump_ratings_latest.txt.gz",
@@ -83,6 +92,77 @@ class DataProcessor(ABC):
             "%20NULL%20LAST%20LIMIT%202147483647": "seattle library dump/checkouts.json"
         }
 
+    @property
+    def writers(self) -> list[FileWriter]:
+        """
+        The user manager and the parsers, which write the output tables.
+
+        Returns:
+            list[FileWriter]: The writers.
+        """
+        return [
+            self.user_manager,
+            self.old_parser,
+            *self.ol_parsers,
+            self.sl_parser,
+            self.language_parser,
+        ]
+
+    def set_write_behind(self, enabled: bool) -> None:
+        """
+        Makes every writer write its output blocks on a write-behind thread.
+
+        Args:
+            enabled (bool): Whether the blocks are written behind.
+
+        Returns:
+            None
+        """
+        for writer in self.writers:
+            writer.write_behind = enabled
+
+    def set_compression_level(self, level: int | None) -> None:
+        """
+        Sets the compression level of the compressed outputs of every writer.
+
+        Args:
+            level (int | None): The compression level, or None for the default.
+
+        Returns:
+            None
+        """
+        for writer in self.writers:
+            writer.compression_level = level
+
+    def set_sort_output(self, enabled: bool) -> None:
+        """
+        Makes every writer emit its tables ordered by their primary key.
+
+        Args:
+            enabled (bool): Whether the tables are sorted.
+
+        Returns:
+            None
+        """
+        for writer in self.writers:
+            writer.sort_output = enabled
+
+    def set_shard_limits(self, rows: int | None, size: int | None) -> None:
+        """
+        Rotates the outputs of every writer into shards of at most `rows` rows
+        or about `size` bytes, listed in a manifest for every table.
+
+        Args:
+            rows (int | None): The number of rows of a shard, or None.
+            size (int | None): The size of a shard in bytes, or None.
+
+        Returns:
+            None
+        """
+        for writer in self.writers:
+            writer.shard_rows = rows
+            writer.shard_bytes = size
+
     def __del__(self) -> None:
         """
         Closes the connection to the database.
@@ -0,0 +1,100 @@
+class EditionSelector:
+    """
+    Keeps the best edition of every work while the dump is being scanned.
+
+    Every work owns a single slot holding the completeness score of the
+    current winner and its row. The integer ISBN-13s taken by winners are kept
+    in a set, so an edition whose ISBN already belongs to another work is
+    rejected before any further processing is spent on it.
+
+    Attributes:
+        __slots (dict[int, tuple[int, int, tuple]]): A dictionary mapping work IDs
+            to (score, isbn, row) of the current winner.
+        __isbns (set[int]): A set of ISBNs taken by the current winners.
+    """
+
+    def __init__(self) -> None:
+        self.__slots: dict[int, tuple[int, int, tuple]] = {}
+        self.__isbns: set[int] = set()
+
+    @staticmethod
+    def score(obj: dict, isbn: int | None) -> int:
+        """
+        Computes the completeness score of an edition.
+
+        Args:
+            obj (dict): The edition object.
+            isbn (int | None): The ISBN-13 of the edition.
+
+        Returns:
+            int: The score, higher meaning more complete. ISBN presence weighs
+                the most, followed by pages, language and publisher.
+        """
+        return (
+            (8 if isbn else 0)
+            | (4 if obj.get("number_of_pages") else 0)
+            | (2 if obj.get("languages") else 0)
+            | (1 if obj.get("publishers") else 0)
+        )
+
+    def accepts(self, work_id: int, isbn: int, score: int) -> bool:
+        """
+        Checks whether an edition would replace the current winner of its work.
+
+        Args:
+            work_id (int): The ID of the work.
+            isbn (int): The ISBN-13 of the edition.
+            score (int): The completeness score of the edition.
+
+        Returns:
+            bool: True if the edition is better than the current winner and its
+                ISBN is not taken by another work, False otherwise.
+        """
+        slot = self.__slots.get(work_id)
+        if isbn in self.__isbns and (not slot or slot[1] != isbn):
+            return False
+        return not slot or score > slot[0]
+
+    def select(self, work_id: int, isbn: int, score: int, row: tuple) -> None:
+        """
+        Stores an edition as the winner of its work, releasing the ISBN of the
+        previous winner.
+
+        Args:
+            work_id (int): The ID of the work.
+            isbn (int): The ISBN-13 of the edition.
+            score (int): The completeness score of the edition.
+            row (tuple): The work row to be written.
+
+        Returns:
+            None
+        """
+        if slot := self.__slots.get(work_id):
+            self.__isbns.discard(slot[1])
+        self.__isbns.add(isbn)
+        self.__slots[work_id] = (score, isbn, row)
+
+    def row(self, work_id: int) -> tuple | None:
+        """
+        Returns the row of the current winner of a work.
+
+        Args:
+            work_id (int): The ID of the work.
+
+        Returns:
+            tuple | None: The work row, or None if the work has no winner yet.
+        """
+        slot = self.__slots.get(work_id)
+        return slot[2] if slot else None
+
+    def winners(self):
+        """
+        Yields the rows of the winning editions.
+
+        Returns:
+            Iterator[tuple]: The work rows in order of first appearance of the works.
+        """
+        return (row for _, _, row in self.__slots.values())
+
+    def __len__(self) -> int:
+        return len(self.__slots)
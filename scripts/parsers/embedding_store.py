@@ -0,0 +1,201 @@
+from functools import lru_cache
+
+import os
+import numpy as np
+import orjson
+
+
+class EmbeddingStore:
+    """
+    A compact, memory-mapped replacement of a fastText model for subject
+    classification.
+
+    The store keeps only the input matrix rows of the words and character
+    n-grams that occur in the subjects it was built from, optionally projected
+    onto fewer dimensions, as a float16 matrix. Word vectors are rebuilt the way
+    fastText does it, by averaging the rows of the word and its n-grams, so
+    words unseen at build time still get a vector from the n-grams they share
+    with known words.
+
+    Attributes:
+        minn (int): The minimum length of character n-grams.
+        maxn (int): The maximum length of character n-grams.
+        __matrix (np.memmap): The memory-mapped embedding rows.
+        __word_rows (dict[str, int]): A dictionary mapping words to their rows.
+        __ngram_rows (dict[str, int]): A dictionary mapping n-grams to their rows.
+    """
+
+    DEFAULT_PATH = "cc.en.300.subjects"
+    WORD_CACHE_SIZE = 1 << 16
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        """
+        Initializes an EmbeddingStore object.
+
+        Args:
+            path (str): The path of the artifact without extension.
+
+        Returns:
+            None
+        """
+        with open(f"{path}.json", "rb") as f:
+            meta = orjson.loads(f.read())
+
+        self.minn = meta["minn"]
+        self.maxn = meta["maxn"]
+        self.__matrix = np.load(f"{path}.npy", mmap_mode="r")
+        self.__word_rows = dict(zip(meta["words"], meta["word_rows"]))
+        self.__ngram_rows = dict(zip(meta["ngrams"], meta["ngram_rows"]))
+
+        self.get_word_vector = lru_cache(maxsize=EmbeddingStore.WORD_CACHE_SIZE)(
+            self.__get_word_vector
+        )
+
+    @staticmethod
+    def exists(path: str = DEFAULT_PATH) -> bool:
+        """
+        Checks whether an artifact has been built at the given path.
+
+        Args:
+            path (str): The path of the artifact without extension.
+
+        Returns:
+            bool: True if both artifact files exist, False otherwise.
+        """
+        return os.path.exists(f"{path}.json") and os.path.exists(f"{path}.npy")
+
+    @staticmethod
+    def fingerprint(path: str = DEFAULT_PATH) -> str:
+        """
+        Identifies the build of the artifact at the given path.
+
+        Args:
+            path (str): The path of the artifact without extension.
+
+        Returns:
+            str: The modification time and size of the embedding rows.
+        """
+        stat = os.stat(f"{path}.npy")
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def get_dimension(self) -> int:
+        """
+        Returns the dimension of the stored vectors.
+
+        Returns:
+            int: The dimension.
+        """
+        return self.__matrix.shape[1]
+
+    def ngrams(self, word: str) -> list[str]:
+        """
+        Computes the character n-grams of a word the way fastText does.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            list[str]: The n-grams of the word wrapped in '<' and '>'.
+        """
+        word = f"<{word}>"
+        return [
+            word[i : i + n]
+            for i in range(len(word))
+            for n in range(self.minn, self.maxn + 1)
+            if i + n <= len(word) and not (n == 1 and (i == 0 or i + n == len(word)))
+        ]
+
+    def __get_word_vector(self, word: str) -> np.ndarray:
+        """
+        Computes the vector of a word as the mean of its known rows.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            np.ndarray: The word vector, or zeros if no row of the word is known.
+        """
+        rows = [self.__word_rows[word]] if word in self.__word_rows else []
+        rows.extend(
+            self.__ngram_rows[ngram]
+            for ngram in self.ngrams(word)
+            if ngram in self.__ngram_rows
+        )
+        if not rows:
+            return np.zeros(self.get_dimension(), dtype=np.float32)
+        return self.__matrix[rows].astype(np.float32).mean(axis=0)
+
+    def get_sentence_vector(self, text: str) -> np.ndarray:
+        """
+        Computes the sentence vector as the mean of the unit word vectors,
+        matching fastText's unsupervised sentence vectors.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            np.ndarray: The sentence vector.
+        """
+        vector = np.zeros(self.get_dimension(), dtype=np.float32)
+        count = 0
+        for word in text.split():
+            word_vector = self.get_word_vector(word)
+            if (norm := np.linalg.norm(word_vector)) > 0:
+                vector += word_vector / norm
+                count += 1
+        return vector / count if count else vector
+
+    @staticmethod
+    def build(model, texts: list[str], path: str = DEFAULT_PATH, dim: int | None = None) -> str:
+        """
+        Builds an artifact from a fastText model, restricted to the words of the
+        given texts and the character n-grams of those words.
+
+        Args:
+            model (FastText._FastText): The full fastText model.
+            texts (list[str]): The preprocessed texts the artifact must cover.
+            path (str): The path of the artifact without extension.
+            dim (int | None): The number of dimensions to keep. The rows are
+                projected onto their top principal directions when it is lower
+                than the model's dimension.
+
+        Returns:
+            str: The path of the artifact.
+        """
+        args = model.f.getArgs()
+        rows: dict[int, int] = {}
+        word_rows: dict[str, int] = {}
+        ngram_rows: dict[str, int] = {}
+
+        for word in sorted({word for text in texts for word in text.split()}):
+            word_id = model.get_word_id(word)
+            for subword, subword_id in zip(*model.get_subwords(word)):
+                row = rows.setdefault(int(subword_id), len(rows))
+                if subword_id == word_id and subword == word:
+                    word_rows[word] = row
+                else:
+                    ngram_rows[subword] = row
+
+        matrix = np.array(
+            [model.get_input_vector(subword_id) for subword_id in rows],
+            dtype=np.float32,
+        ).reshape(len(rows), model.get_dimension())
+        if dim and dim < matrix.shape[1]:
+            _, eigenvectors = np.linalg.eigh(matrix.T @ matrix)
+            matrix = matrix @ eigenvectors[:, ::-1][:, :dim]
+
+        np.save(f"{path}.npy", matrix.astype(np.float16))
+        with open(f"{path}.json", "wb") as f:
+            f.write(
+                orjson.dumps(
+                    {
+                        "minn": args.minn,
+                        "maxn": args.maxn,
+                        "words": list(word_rows.keys()),
+                        "word_rows": list(word_rows.values()),
+                        "ngrams": list(ngram_rows.keys()),
+                        "ngram_rows": list(ngram_rows.values()),
+                    }
+                )
+            )
+        return path
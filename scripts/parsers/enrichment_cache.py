@@ -0,0 +1,210 @@
+from collections import defaultdict
+from typing import Any, Callable, Iterable
+
+import hashlib
+import sqlite3
+import orjson
+
+
+class EnrichmentCache:
+    """
+    A persistent, content-addressed cache of enrichment results shared by the
+    monthly runs.
+
+    Every result is stored in an SQLite file under a hash of the enrichment's
+    namespace, its version and the input text, so changing an algorithm only
+    requires bumping its version. Lookups and inserts are batched. Every run
+    is a new generation and stamps the entries it uses with it. When the cache
+    is closed, entries beyond `max_entries` are evicted starting with the ones
+    unused for the most generations.
+
+    Attributes:
+        path (str): The path of the SQLite file.
+        max_entries (int): The maximum number of entries kept after eviction.
+        __conn (sqlite3.Connection | None): The connection, opened on first use.
+        __generation (int): The generation of the current run.
+        __stats (defaultdict[str, list[int]]): Hits and misses of every namespace.
+    """
+
+    DEFAULT_PATH = "enrichment_cache.sqlite3"
+    MAX_ENTRIES = 10_000_000
+    BATCH_SIZE = 900
+    KEY_SIZE = 16
+
+    def __init__(self, path: str = DEFAULT_PATH, max_entries: int = MAX_ENTRIES) -> None:
+        """
+        Initializes an EnrichmentCache object.
+
+        Args:
+            path (str): The path of the SQLite file.
+            max_entries (int): The maximum number of entries kept after eviction.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.__conn = None
+        self.__generation = 0
+        self.__stats: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0])
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        The connection to the cache, opened on first use, which also starts a
+        new generation.
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        if self.__conn is None:
+            self.__conn = sqlite3.connect(self.path)
+            self.__conn.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                CREATE TABLE IF NOT EXISTS entry (
+                    key BLOB PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    used_at INTEGER NOT NULL
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_entry_used_at ON entry(used_at);
+                CREATE TABLE IF NOT EXISTS generation (value INTEGER NOT NULL);
+                """
+            )
+            (last,) = self.__conn.execute("SELECT MAX(value) FROM generation").fetchone()
+            self.__generation = (last or 0) + 1
+            self.__conn.execute("INSERT INTO generation VALUES (?)", (self.__generation,))
+        return self.__conn
+
+    @staticmethod
+    def key(namespace: str, version: str, text: str) -> bytes:
+        """
+        Computes the content address of an input.
+
+        Args:
+            namespace (str): The name of the enrichment.
+            version (str): The version of the enrichment.
+            text (str): The input text.
+
+        Returns:
+            bytes: The hash of the namespace, the version and the text.
+        """
+        return hashlib.blake2b(
+            f"{namespace}\0{version}\0{text}".encode("utf-8", "surrogatepass"),
+            digest_size=EnrichmentCache.KEY_SIZE,
+        ).digest()
+
+    def get_many(self, namespace: str, version: str, texts: Iterable[str]) -> dict[str, Any]:
+        """
+        Looks up the cached results of the given inputs.
+
+        Args:
+            namespace (str): The name of the enrichment.
+            version (str): The version of the enrichment.
+            texts (Iterable[str]): The input texts.
+
+        Returns:
+            dict[str, Any]: A dictionary mapping the cached inputs to their results.
+        """
+        keys = {self.key(namespace, version, text): text for text in dict.fromkeys(texts)}
+        found = {}
+        key_list = list(keys)
+        for start in range(0, len(key_list), EnrichmentCache.BATCH_SIZE):
+            batch = key_list[start : start + EnrichmentCache.BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT key, value FROM entry WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            self.conn.execute(
+                f"UPDATE entry SET used_at = ? WHERE key IN ({placeholders})",
+                [self.__generation, *batch],
+            )
+            found.update((keys[key], orjson.loads(value)) for key, value in rows)
+
+        self.__stats[namespace][0] += len(found)
+        self.__stats[namespace][1] += len(keys) - len(found)
+        return found
+
+    def put_many(self, namespace: str, version: str, results: Iterable[tuple[str, Any]]) -> None:
+        """
+        Stores the results of the given inputs.
+
+        Args:
+            namespace (str): The name of the enrichment.
+            version (str): The version of the enrichment.
+            results (Iterable[tuple[str, Any]]): The inputs and their JSON-serializable results.
+
+        Returns:
+            None
+        """
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entry VALUES (?, ?, ?)",
+            (
+                (self.key(namespace, version, text), orjson.dumps(result), self.__generation)
+                for text, result in results
+            ),
+        )
+        self.conn.commit()
+
+    def cached(
+        self,
+        namespace: str,
+        version: str,
+        texts: list[str],
+        compute: Callable[[list[str]], Iterable[Any]],
+    ) -> list[Any]:
+        """
+        Returns the results of the given inputs, computing only the uncached
+        ones in a single batch and storing them.
+
+        Args:
+            namespace (str): The name of the enrichment.
+            version (str): The version of the enrichment.
+            texts (list[str]): The input texts.
+            compute (Callable): A function returning the results of a list of inputs.
+
+        Returns:
+            list[Any]: The result of every input, in order.
+        """
+        results = self.get_many(namespace, version, texts)
+        if missing := [text for text in dict.fromkeys(texts) if text not in results]:
+            computed = list(zip(missing, compute(missing)))
+            self.put_many(namespace, version, computed)
+            results.update(computed)
+        return [results[text] for text in texts]
+
+    def stats(self) -> dict[str, tuple[int, int]]:
+        """
+        Returns the hit and miss counts of every namespace in the current run.
+
+        Returns:
+            dict[str, tuple[int, int]]: A dictionary mapping namespaces to their
+                distinct input hits and misses.
+        """
+        return {namespace: (hits, misses) for namespace, (hits, misses) in self.__stats.items()}
+
+    def close(self) -> None:
+        """
+        Evicts the least recently used entries beyond `max_entries` and closes
+        the connection.
+
+        Returns:
+            None
+        """
+        if self.__conn is None:
+            return
+
+        (count,) = self.__conn.execute("SELECT COUNT(*) FROM entry").fetchone()
+        if count > self.max_entries:
+            self.__conn.execute(
+                """
+                DELETE FROM entry WHERE key IN (
+                    SELECT key FROM entry ORDER BY used_at LIMIT ?
+                )
+                """,
+                (count - self.max_entries,),
+            )
+        self.__conn.commit()
+        self.__conn.close()
+        self.__conn = None
@@ -0,0 +1,139 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable
+
+import re
+
+
+class FieldExtractor:
+    """
+    Extracts the publication year, the weight and the page count of editions
+    from their raw string fields.
+
+    The same few thousand values ('1998', 'January 1, 2005', '1 pounds',
+    'xii, 345 p.') repeat across millions of editions, so every extractor is
+    memoized with a bounded LRU cache keyed on the raw string. The distinct
+    values of a whole chunk of editions can be resolved at once with `resolve`,
+    after which the per-edition lookups are cache hits.
+
+    Attributes:
+        year (Callable[[str], int]): The memoized year extractor.
+        weight (Callable[[str], float | None]): The memoized weight extractor.
+        pages (Callable[[str], int | None]): The memoized page count extractor.
+    """
+
+    CACHE_SIZE = 1 << 16
+    MAX_PAGES = 5000
+    YEAR_PATTERN = re.compile(r"\b\d{4}\b")
+    NUMBER_PATTERN = re.compile(r"\d+(\.\d+)?")
+    PAGES_PATTERN = re.compile(r"(\d+)\s*(?:p|pages?)\b", re.IGNORECASE)
+    FIELDS = {"publish_date": "year", "weight": "weight", "pagination": "pages"}
+
+    def __init__(self) -> None:
+        """
+        Initializes a FieldExtractor object.
+
+        Returns:
+            None
+        """
+        self.__current_year = datetime.now().year
+        self.year = lru_cache(maxsize=FieldExtractor.CACHE_SIZE)(self.__find_year)
+        self.weight = lru_cache(maxsize=FieldExtractor.CACHE_SIZE)(self.__find_weight_in_kg)
+        self.pages = lru_cache(maxsize=FieldExtractor.CACHE_SIZE)(self.__find_pages)
+
+    def resolve(self, objs: Iterable[dict]) -> None:
+        """
+        Resolves the distinct field values of a batch of editions into the caches.
+
+        Args:
+            objs (Iterable[dict]): The edition objects.
+
+        Returns:
+            None
+        """
+        values = {field: set() for field in FieldExtractor.FIELDS}
+        for obj in objs:
+            for field, distinct in values.items():
+                if isinstance(value := obj.get(field), str) and value:
+                    distinct.add(value)
+
+        for field, distinct in values.items():
+            extract = getattr(self, FieldExtractor.FIELDS[field])
+            for value in distinct:
+                extract(value)
+
+    def hit_rates(self) -> dict[str, float]:
+        """
+        Computes the cache hit rate of every extractor.
+
+        Returns:
+            dict[str, float]: A dictionary mapping extractor names to the share
+                of lookups answered by their cache.
+        """
+        rates = {}
+        for name in FieldExtractor.FIELDS.values():
+            info = getattr(self, name).cache_info()
+            rates[name] = info.hits / (info.hits + info.misses) if info.hits + info.misses else 0.0
+        return rates
+
+    def __find_year(self, s: str) -> int:
+        """
+        Finds the first occurrence of a 4-digit year in a given string.
+
+        Args:
+            s (str): The input string to search for a year.
+
+        Returns:
+            int: The found year if it is less than or equal to the current year, otherwise 0.
+        """
+        for match in FieldExtractor.YEAR_PATTERN.finditer(s):
+            if (year := int(match.group())) <= self.__current_year:
+                return year
+        return 0
+
+    @staticmethod
+    def __find_weight_in_kg(s: str) -> float | None:
+        """
+        Finds the weight in kilograms from a given string.
+
+        Args:
+            s (str): The input string.
+
+        Returns:
+            float | None: The weight in kilograms, rounded to 2 decimal places.
+                Returns None if the weight cannot be found.
+        """
+        if not (match := FieldExtractor.NUMBER_PATTERN.search(s)):
+            return None
+
+        if "k" in s:
+            conversion_factor = 1
+        elif "g" in s:
+            conversion_factor = 1 / 1000
+        elif "z" in s or "ounc" in s:
+            conversion_factor = 1 / 35.284
+        elif "lb" in s or "pound" in s:
+            conversion_factor = 1 / 2.205
+        else:
+            conversion_factor = 1
+
+        weight = float(match.group()) * conversion_factor
+        return round(weight, 2) if weight else None
+
+    @staticmethod
+    def __find_pages(s: str) -> int | None:
+        """
+        Finds the page count in a pagination string, e.g. 'xii, 345 p. : ill. ; 24 cm'.
+
+        Args:
+            s (str): The pagination string.
+
+        Returns:
+            int | None: The largest number of pages in the string, or None if there
+                is none or it is larger than `MAX_PAGES`.
+        """
+        if (s := s.strip()).isdigit():
+            pages = int(s)
+        else:
+            pages = max(map(int, FieldExtractor.PAGES_PATTERN.findall(s)), default=0)
+        return pages if 0 < pages <= FieldExtractor.MAX_PAGES else None
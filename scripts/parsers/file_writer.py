@@ -1,56 +1,114 @@
-from io import TextIOWrapper
-import orjson
-import csv
+from parsers.table_sink import SINKS, TABLE_SORT_KEYS, GzipCsvSink, TableSink
+from parsers.async_sink import AsyncSink
+from parsers.sharded_sink import ShardedSink
+from parsers.sorted_sink import SortedSink
+
+from datetime import datetime
+from typing import Iterable
 
 
 class FileWriter:
     """
-    A class that provides functionality to write data to different file types.
+    A class that provides functionality to write tables to different file types.
 
     Args:
-        file_type (str): The type of file to write ('csv').
+        file_type (str): The type of file to write, a key of `SINKS` ('csv').
 
     Attributes:
-        _write_strategy (function): The write strategy based on the file type.
         type_name (str): The type of file being written.
+        compression_level (int | None): The compression level of the compressed
+            file types, or None for their default.
+        write_behind (bool): Whether the sinks write their blocks on a separate thread.
+        shard_rows (int | None): The number of rows after which an output is
+            rotated to a new shard, or None.
+        shard_bytes (int | None): The size after which an output is rotated to
+            a new shard, or None.
+        sort_output (bool): Whether the tables emitted out of key order are
+            written ordered by their primary key.
 
     Methods:
-        _write_csv: Writes data to a CSV file.
+        open_sink: Opens a buffered sink for an output table.
+        print_write_stats: Prints the overlap of the write-behind sinks with parsing.
     """
 
     def __init__(self, file_type = 'csv') -> None:
-        if file_type == "csv":
-            self._write_strategy = self.__write_csv
-            self._tuple_write_strategy = self.__write_csv_tuple
+        if file_type not in SINKS:
+            raise ValueError(f"Unsupported file type '{file_type}'")
 
         self.type_name = file_type
+        self.compression_level = None
+        self.write_behind = False
+        self.shard_rows = None
+        self.shard_bytes = None
+        self.sort_output = False
 
-    @staticmethod
-    def __write_csv(file: TextIOWrapper, obj: dict) -> None:
+    def open_sink(self, path: str, table: str) -> TableSink:
         """
-        Writes a dictionary object to a CSV file.
+        Opens a sink writing a table to a file of the writer's file type, on a
+        write-behind thread if `write_behind` is enabled. If `shard_rows` or
+        `shard_bytes` is set, the table is rotated into numbered shards listed
+        in a manifest instead of being written to `path`. If `sort_output` is
+        enabled, the rows of the tables emitted out of key order, those of
+        `TABLE_SORT_KEYS`, are written on close, ordered by the primary key.
 
         Args:
-            file (str): The file path to write to.
-            obj (dict): The dictionary object to write.
+            path (str): The path of the output file.
+            table (str): The name of the table.
 
         Returns:
-            None
+            TableSink: The sink, to be closed once the table is written.
         """
-        writer = csv.DictWriter(file, fieldnames=obj.keys(), quoting=csv.QUOTE_ALL)
-        writer.writerow(obj)
+        if self.shard_rows is None and self.shard_bytes is None:
+            sink = self.__open_file_sink(path, table)
+        else:
+            sink = ShardedSink(
+                lambda shard_path: self.__open_file_sink(shard_path, table),
+                path,
+                table,
+                self.shard_rows,
+                self.shard_bytes,
+            )
+        if self.sort_output and table in TABLE_SORT_KEYS:
+            sink = SortedSink(sink)
+        return AsyncSink(sink) if self.write_behind else sink
+
+    def __open_file_sink(self, path: str, table: str) -> TableSink:
+        """
+        Opens a sink of the writer's file type writing a single file.
+
+        Args:
+            path (str): The path of the output file.
+            table (str): The name of the table.
+
+        Returns:
+            TableSink: The sink.
+        """
+        sink_type = SINKS[self.type_name]
+        if self.compression_level is not None and issubclass(sink_type, GzipCsvSink):
+            return sink_type(path, table, compression_level=self.compression_level)
+        return sink_type(path, table)
 
     @staticmethod
-    def __write_csv_tuple(file: TextIOWrapper, rows: list[tuple]) -> None:
+    def print_write_stats(sinks: Iterable[TableSink]) -> None:
         """
-        Writes a list of dictionary objects to a CSV file.
+        Prints the time the write-behind sinks spent writing and the upper bound
+        of the part of it overlapped with parsing.
 
         Args:
-            file (str): The file path to write to.
-            rows (list[any]): Rows fetched from database.
+            sinks (Iterable[TableSink]): The closed sinks.
 
         Returns:
             None
         """
-        writer = csv.writer(file, quoting=csv.QUOTE_ALL)
-        writer.writerows(rows)
+        sinks = [sink for sink in sinks if isinstance(sink, AsyncSink)]
+        stats = [sink.stats() for sink in sinks]
+        if not stats:
+            return
+
+        write = sum(stat["write"] for stat in stats)
+        overlap = sum(stat["overlap"] for stat in stats)
+        print(
+            f"Wrote {', '.join(sink.table for sink in sinks)}: {write:.2f} s writing, "
+            f"at most {overlap:.2f} s overlapped with parsing - {datetime.now().isoformat()}",
+            flush=True,
+        )
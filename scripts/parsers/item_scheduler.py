@@ -0,0 +1,71 @@
+from typing import Iterable
+
+import heapq
+import itertools
+import sys
+
+
+class ItemScheduler:
+    """
+    Assigns the loans of a work to its inventory items.
+
+    The items are kept in a min-heap keyed by the time they are returned, so
+    assigning a loan pops the item that became free the earliest in
+    O(log items). When even that item is still on loan, the loan falls back to
+    it anyway, being the one returned the soonest, and the overlap is counted.
+    Loans have to be assigned in chronological order, with their times given
+    as integers, e.g. microseconds since the epoch.
+
+    Attributes:
+        loans (int): The number of assigned loans.
+        conflicts (int): The number of loans assigned to an item still on loan.
+        __heap (list[tuple[int, int, int]]): The free time, the insertion
+            order and the ID of every item.
+    """
+
+    AVAILABLE = -sys.maxsize - 1
+    NEVER_RETURNED = sys.maxsize
+
+    def __init__(self, item_ids: Iterable[int]) -> None:
+        """
+        Initializes an ItemScheduler object with every item free.
+
+        Args:
+            item_ids (Iterable[int]): The IDs of the items of the work.
+
+        Returns:
+            None
+        """
+        self.__order = itertools.count()
+        self.__heap = [
+            (ItemScheduler.AVAILABLE, next(self.__order), item_id) for item_id in item_ids
+        ]
+        heapq.heapify(self.__heap)
+        self.loans = 0
+        self.conflicts = 0
+
+    def assign(self, loaned_at: int, returned_at: int | None) -> int:
+        """
+        Assigns a loan to the item free the earliest.
+
+        Args:
+            loaned_at (int): The time of the loan.
+            returned_at (int | None): The time of the return, or None if the
+                item is never returned.
+
+        Returns:
+            int: The ID of the assigned item.
+        """
+        free_at, _, item_id = self.__heap[0]
+        self.loans += 1
+        if free_at > loaned_at:
+            self.conflicts += 1
+        heapq.heapreplace(
+            self.__heap,
+            (
+                ItemScheduler.NEVER_RETURNED if returned_at is None else returned_at,
+                next(self.__order),
+                item_id,
+            ),
+        )
+        return item_id
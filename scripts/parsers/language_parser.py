@@ -1,20 +1,42 @@
 import pandas as pd
-import csv
+import os
 from language_speakers import speakers
 from datetime import datetime
+from parsers.file_writer import FileWriter
+
+class LanguageParser(FileWriter):
+    LANGUAGES_FILE = r"open library dump\iso-639-2-languages.csv"
+
+    @staticmethod
+    def load_ids(file_in: str = LANGUAGES_FILE) -> set[str]:
+        """
+        Loads the IDs of the languages written to the lang table.
+
+        Args:
+            file_in (str): The path to the ISO 639-2 languages file.
+
+        Returns:
+            set[str]: The language IDs, or an empty set if the file does not exist.
+        """
+        if not os.path.exists(file_in):
+            return set()
+        return set(pd.read_csv(file_in, names=["id", "name"], usecols=["id"])["id"])
 
-class LanguageParser:
     def run(
         self,
-        file_in: str = "open library dump\iso-639-2-languages.csv",
-        file_out: str = "open library dump\data\lang.csv",
+        file_in: str = LANGUAGES_FILE,
+        file_out: str | None = None,
     ) -> str:
+        file_out = file_out or rf"open library dump\data\lang.{self.type_name}"
         df = pd.read_csv(file_in, names=["id", "name"])
 
         df["speakers"] = df["id"].map(speakers).fillna(0).astype(int)
         
         df["modified_at"] = datetime.now().isoformat()
 
-        df.to_csv(file_out, index=False, header=False, encoding="utf-8", quoting=csv.QUOTE_ALL)
+        with self.open_sink(file_out, "lang") as sink:
+            sink.extend(
+                df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+            )
         
         return file_out
@@ -0,0 +1,222 @@
+from typing import Callable
+import hashlib
+import re
+
+
+class LanguageResolver:
+    """
+    Resolves the language of editions, running the language detector only when
+    nothing cheaper decides it.
+
+    The language is taken, in order, from the edition's `languages` field, from
+    the language already decided for another edition of the same work, and from
+    the Unicode script of the title when the script belongs to a single
+    language. Han characters are only taken as Chinese when the title has no
+    kana and Japanese is not a candidate language, since kanji-only titles can
+    be Japanese. The remaining titles are reported as undecided and detected in
+    batches with lingua's parallel API, restricted to the languages of the
+    `lang` table.
+
+    Attributes:
+        __language_ids_loader (Callable): A function returning the language IDs
+            of the `lang` table.
+        __language_ids (set[str] | None): The language IDs, loaded on first use.
+        __detector (LanguageDetector | None): The language detector, built on first use.
+    """
+
+    UNDECIDED = object()
+    VERSION = "1"
+
+    LANGUAGE_MAPPING: dict[str, str | None] = {
+        "bel": None,
+        "rus": None,
+        "vls": "nld",
+        "fre": "fra",
+        "cze": "ces",
+        "wel": "cym",
+        "ger": "deu",
+        "gre": "ell",
+        "baq": "eus",
+        "per": "fas",
+        "chi": "zho",
+        "ice": "isl",
+        "arm": "hye",
+        "mac": "mkd",
+        "dut": "nld",
+        "slo": "slk",
+        "geo": "kat",
+        "rum": "ron",
+        "may": "msa",
+        "alb": "sqi",
+        "mao": "mri",
+        "scr": "hrv",
+        "esp": "epo",
+        "eth": "gez",
+        "far": "fao",
+        "fri": "fry",
+        "gag": "glg",
+        "gua": "grn",
+        "iri": "gle",
+        "cam": "khm",
+        "mla": "mlg",
+        "lan": "oci",
+        "gal": "orm",
+        "lap": "smi",
+        "sao": "smo",
+        "scc": "srp",
+        "snh": "sin",
+        "sho": "sna",
+        "sso": "sot",
+        "swz": "ssw",
+        "tag": "tgl",
+        "tgk": "taj",
+        "tar": "tat",
+        "tsw": "tsn",
+        "int": "ina",
+    }
+
+    LATIN_PATTERN = re.compile(r"[A-Za-zÀ-ɏ]")
+    # Scripts used by a single language among the detectable ones, checked in order,
+    # so that Han is only reached for titles without kana.
+    SCRIPT_PATTERNS: list[tuple[re.Pattern, str | None]] = [
+        (re.compile(r"[ЇїЄєҐґ]"), "ukr"),
+        (re.compile(r"[Ўў]"), None),
+        (re.compile(r"[぀-ヿ]"), "jpn"),
+        (re.compile(r"[ᄀ-ᇿ가-힯]"), "kor"),
+        (re.compile(r"[一-鿿]"), "zho"),
+        (re.compile(r"[Ͱ-Ͽ]"), "ell"),
+        (re.compile(r"[԰-֏]"), "hye"),
+        (re.compile(r"[Ⴀ-ჿ]"), "kat"),
+        (re.compile(r"[֐-׿]"), "heb"),
+        (re.compile(r"[฀-๿]"), "tha"),
+        (re.compile(r"[ঀ-৿]"), "ben"),
+        (re.compile(r"[਀-੿]"), "pan"),
+        (re.compile(r"[઀-૿]"), "guj"),
+        (re.compile(r"[஀-௿]"), "tam"),
+        (re.compile(r"[ఀ-౿]"), "tel"),
+    ]
+
+    def __init__(self, language_ids_loader: Callable[[], set[str]]) -> None:
+        """
+        Initializes a LanguageResolver object.
+
+        Args:
+            language_ids_loader (Callable): A function returning the language IDs
+                of the `lang` table, or an empty set if they are unknown.
+
+        Returns:
+            None
+        """
+        self.__language_ids_loader = language_ids_loader
+        self.__language_ids = None
+        self.__detector = None
+
+    @property
+    def language_ids(self) -> set[str]:
+        """
+        The language IDs of the `lang` table, loaded on first use.
+
+        Returns:
+            set[str]: The language IDs, or an empty set if they are unknown.
+        """
+        if self.__language_ids is None:
+            self.__language_ids = self.__language_ids_loader()
+        return self.__language_ids
+
+    @property
+    def version(self) -> str:
+        """
+        The version of the detection results, which also changes with the
+        languages the detector is restricted to.
+
+        Returns:
+            str: The version.
+        """
+        languages = ",".join(sorted(self.language_ids)).encode()
+        return f"{LanguageResolver.VERSION}-{hashlib.md5(languages).hexdigest()[:8]}"
+
+    @property
+    def detector(self):
+        """
+        The language detector, built on first use from the languages of the
+        `lang` table and the languages that are rejected, or from all languages
+        if the `lang` table is unknown.
+
+        Returns:
+            LanguageDetector: A low accuracy language detector.
+        """
+        if self.__detector is None:
+            from lingua import Language, LanguageDetectorBuilder
+
+            language_ids = self.language_ids
+            known_ids = language_ids | {self.map_language(id) for id in language_ids}
+            candidates = [
+                language
+                for language in Language.all()
+                if (id := self.map_language(language.iso_code_639_3.name.lower()))
+                in known_ids
+                or id is None
+            ]
+            builder = (
+                LanguageDetectorBuilder.from_languages(*candidates)
+                if language_ids and len(candidates) > 1
+                else LanguageDetectorBuilder.from_all_languages()
+            )
+            self.__detector = builder.with_low_accuracy_mode().build()
+        return self.__detector
+
+    def resolve(self, obj: dict, title: str, work_language: str | None = None):
+        """
+        Resolves the language of an edition without running the detector.
+
+        Args:
+            obj (dict): The edition object.
+            title (str): The title of the edition.
+            work_language (str | None): The language already decided for the work.
+
+        Returns:
+            str | None | object: The language ID, None if the language is rejected,
+                or `LanguageResolver.UNDECIDED` if the title has to be detected.
+        """
+        if languages := obj.get("languages"):
+            return self.map_language(languages[0]["key"].split("/")[-1])
+        if work_language:
+            return work_language
+        if not LanguageResolver.LATIN_PATTERN.search(title):
+            for pattern, language in LanguageResolver.SCRIPT_PATTERNS:
+                if pattern.search(title):
+                    if language == "zho" and (
+                        not self.language_ids or "jpn" in self.language_ids
+                    ):
+                        break
+                    return language
+        return LanguageResolver.UNDECIDED
+
+    def detect(self, titles: list[str]) -> list[str | None]:
+        """
+        Detects the languages of a batch of titles in parallel.
+
+        Args:
+            titles (list[str]): The titles.
+
+        Returns:
+            list[str | None]: The language ID of every title, or None if it is
+                rejected or could not be detected.
+        """
+        return [
+            self.map_language(language.iso_code_639_3.name.lower()) if language else None
+            for language in self.detector.detect_languages_in_parallel_of(titles)
+        ]
+
+    @staticmethod
+    def map_language(language_id: str) -> str | None:
+        """
+        Maps the given language ID to a standardized language ID.
+
+        Args:
+            language_id (str): The language ID to be mapped.
+
+        Returns:
+            str | None: The mapped language ID, or None if the language is rejected.
+        """
+        return LanguageResolver.LANGUAGE_MAPPING.get(language_id, language_id)
@@ -2,14 +2,18 @@ from parsers.ol_abstract_parser import OLAbstractParser
 from parsers.abstract_parser import AbstractParser
 from parsers.user_manager import UserManager
 from parsers.file_writer import FileWriter
+from parsers.table_sink import TableSink
 
 from datetime import datetime
 from typing import Literal
 from enum import Enum
 
-import itertools
+import numpy as np
+import pandas as pd
 import sqlite3
+import time
 import glob
+import csv
 import os
 
 
@@ -33,8 +37,19 @@ class OLRRParser(OLAbstractParser, FileWriter):
     A class for parsing OL readings data.
 
     Inherits from OLAbstractParser.
+
+    The dump is read in large blocks by the pandas C parser. Work keys, values
+    and dates are factorized, so the per-value Python work runs once per
+    distinct value of a block, and the times of day are drawn for a whole
+    block at once.
     """
 
+    BLOCK_SIZE = 500_000
+    TIMES = np.array(
+        [f"{h:02}:{m:02}:{s:02}" for h in range(24) for m in range(60) for s in range(60)],
+        dtype=object,
+    )
+
     def __init__(
         self,
         conn: sqlite3.Connection,
@@ -57,8 +72,9 @@ class OLRRParser(OLAbstractParser, FileWriter):
         OLAbstractParser.__init__(self, user_manager, conn)
         FileWriter.__init__(self, file_type)
 
-        self.__id = itertools.count(1)
+        self.__next_id = 1
         self.__mapped_work_ids = {}
+        self.__rng = np.random.default_rng()
 
         self.strategy_name = strategy
         if strategy == "listing":
@@ -85,21 +101,37 @@ class OLRRParser(OLAbstractParser, FileWriter):
             raise NotADirectoryError(input_file)
 
         self.__load_work_ids()
-        CHUNK_SIZE = 1000
+        work_ids = {
+            old_id: work_id
+            for old_id, work_id in self.__mapped_work_ids.items()
+            if work_id in self.__work_ids
+        }
 
-        with open(input_file, "r", encoding="utf-8") as f_in, open(
-            output_file, "w", encoding="utf-8", newline=""
-        ) as f_out:
+        with self.open_sink(output_file, self.strategy_name) as sink:
             print(f"Reading file '{input_file}'- {datetime.now().isoformat()}", flush=True)
-            while True:
-                lines = list(itertools.islice(f_in, CHUNK_SIZE))
-                if not lines:
-                    break
-
-                self._tuple_write_strategy(
-                    f_out,
-                    list(filter(None, [self.__parse_line(line) for line in lines])),
-                )
+            start = time.perf_counter()
+            rows = 0
+            for block in pd.read_csv(
+                input_file,
+                sep="\t",
+                header=None,
+                names=range(4),
+                dtype=object,
+                quoting=csv.QUOTE_NONE,
+                keep_default_na=False,
+                encoding="utf-8",
+                chunksize=OLRRParser.BLOCK_SIZE,
+                engine="c",
+            ):
+                rows += len(block)
+                self.__process_block(block, work_ids, sink)
+            seconds = time.perf_counter() - start
+            print(
+                f"Parsed {rows:,} rows, {rows / max(seconds, 1e-9):,.0f} rows/s"
+                f" - {datetime.now().isoformat()}",
+                flush=True,
+            )
+        self.print_write_stats([sink])
         return output_file
 
     def process_latest_file(
@@ -123,56 +155,98 @@ class OLRRParser(OLAbstractParser, FileWriter):
             files[0], rf"{directory}\data\{self.strategy_name}.{self.type_name}"
         )
 
-    def __parse_line(self, line: str) -> dict:
+    def __process_block(
+        self, block: pd.DataFrame, work_ids: dict[str, int], sink: TableSink
+    ) -> None:
         """
-        Parse a single line of ratings data.
+        Parse a block of lines and write the rows of the known works.
+
+        Lines have either 4 fields (work, edition, value, date) or 3 fields
+        (work, value, date).
 
         Args:
-            line (str): Line of ratings data.
+            block (pd.DataFrame): The block with a column for every field.
+            work_ids (dict[str, int]): A dictionary mapping the OL keys of the
+                selected works to their IDs.
+            sink (TableSink): The output table.
 
         Returns:
-            dict: Parsed data as a dictionary.
+            None
         """
-        fields = line.split("\t")
-        shift = 1 if len(fields) == 4 else 0
-
-        work_id = fields[0].split("/")[-1]
-        if not (work_id := self.__get_work_id(work_id)):
-            return None
-
-        field = self.__field_strategy(fields, shift)
-        date = f"{fields[2 + shift].strip()}T{self.get_random_time()}"
+        shifted = (block[3] != "").to_numpy()
+        mapped_work_ids = self.__map_distinct(
+            block[0].to_numpy(), lambda key: work_ids.get(key.rpartition("/")[2])
+        )
+        values = self.__map_distinct(
+            np.where(shifted, block[2], block[1]), self.__field_strategy
+        )
+        dates = self.__map_distinct(
+            np.where(shifted, block[3], block[2]),
+            lambda date: f"{date}T" if (date := date.strip()) else None,
+        )
 
-        return (
-            None
-            if not (id := next(self.__id))
-            else (
-                id,
-                self.user_manager.get_or_generate_reader(),
-                work_id,
-                field,
-                date,
+        keep = pd.notna(mapped_work_ids) & pd.notna(values) & pd.notna(dates)
+        if not (count := int(keep.sum())):
+            return
+
+        ids = range(self.__next_id, self.__next_id + count)
+        self.__next_id += count
+        times = OLRRParser.TIMES[self.__rng.integers(len(OLRRParser.TIMES), size=count)]
+        sink.extend(
+            zip(
+                ids,
+                self.user_manager.get_or_generate_readers(count).tolist(),
+                mapped_work_ids[keep].tolist(),
+                values[keep].tolist(),
+                (dates[keep] + times).tolist(),
             )
         )
 
-    def ratings_field_strategy(self, fields: list[str], shift: int):
-        return int(fields[1 + shift])
+    @staticmethod
+    def __map_distinct(column: np.ndarray, func) -> np.ndarray:
+        """
+        Maps every distinct value of a column once.
 
-    def readings_field_strategy(self, fields: list[str], shift: int):
-        return ReadingStatus(fields[1 + shift]).name
+        Args:
+            column (np.ndarray): The column.
+            func (Callable): A function mapping a value, returning None to drop it.
 
-    def __get_work_id(self, old_id: str):
+        Returns:
+            np.ndarray: An object array with the mapped value of every row.
         """
-        Retrieves the work ID associated with the given old ID.
+        codes, uniques = pd.factorize(column)
+        mapped = np.empty(len(uniques) + 1, dtype=object)
+        mapped[:-1] = [func(value) for value in uniques]
+        return mapped[codes]
+
+    @staticmethod
+    def ratings_field_strategy(value: str) -> int | None:
+        """
+        Parses a rating.
 
         Args:
-            old_id (str): The old ID to search for.
+            value (str): The rating field.
 
         Returns:
-            str or None: The work ID if found, None otherwise.
+            int | None: The rating, or None if it is not a number.
+        """
+        return int(value) if value.strip().isdigit() else None
+
+    @staticmethod
+    def readings_field_strategy(value: str) -> str | None:
         """
-        work_id = self.__mapped_work_ids.get(old_id)
-        return work_id if work_id in self.__work_ids else None
+        Parses a reading status.
+
+        Args:
+            value (str): The reading status field.
+
+        Returns:
+            str | None: The name of the reading status, or None if it is unknown.
+        """
+        try:
+            return ReadingStatus(value).name
+        except ValueError:
+            return None
 
     def __load_work_ids(self):
         self.cursor.execute("SELECT work_id FROM work_id")
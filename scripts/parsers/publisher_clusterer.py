@@ -0,0 +1,181 @@
+from collections import defaultdict
+from typing import Iterable
+
+import numpy as np
+
+
+class PublisherClusterer:
+    """
+    Clusters the dedup keys of publisher names whose spellings differ slightly.
+
+    Keys are compared by the Jaccard similarity of their character trigrams.
+    Candidates are found with MinHash locality-sensitive hashing: the MinHash
+    signature of every key is cut into bands, and only keys that agree on a
+    whole band land in the same bucket. Signatures are computed with NumPy for
+    all keys at once, and every key is checked against at most
+    `MAX_BUCKET_COMPARISONS` earlier keys of each bucket, so the whole pass is
+    linear in the number of keys. Candidates are verified with their exact
+    similarity and merged with a union-find structure.
+
+    Attributes:
+        threshold (float): The minimum similarity of two keys in a cluster.
+        __parents (dict[str, str]): The union-find parent of every key.
+    """
+
+    THRESHOLD = 0.75
+    BANDS = 6
+    ROWS_PER_BAND = 4
+    MAX_BUCKET_COMPARISONS = 8
+    MIN_KEY_LENGTH = 5
+    CHUNK_SIZE = 1 << 16
+    PRIME = (1 << 31) - 1
+    SEED = 0
+
+    def __init__(self, threshold: float = THRESHOLD) -> None:
+        """
+        Initializes a PublisherClusterer object.
+
+        Args:
+            threshold (float): The minimum trigram Jaccard similarity of two keys in a cluster.
+
+        Returns:
+            None
+        """
+        self.threshold = threshold
+        self.__parents: dict[str, str] = {}
+
+    def cluster(self, keys: Iterable[str]) -> dict[str, str]:
+        """
+        Clusters the given dedup keys.
+
+        Keys shorter than `MIN_KEY_LENGTH` are too short to compare and only
+        form clusters of their own.
+
+        Args:
+            keys (Iterable[str]): The distinct dedup keys.
+
+        Returns:
+            dict[str, str]: A dictionary mapping every key to the representative
+                key of its cluster, the shortest key of the cluster.
+        """
+        keys = sorted(set(keys), key=lambda key: (len(key), key))
+        self.__parents = {key: key for key in keys}
+
+        comparable = [key for key in keys if len(key) >= PublisherClusterer.MIN_KEY_LENGTH]
+        trigram_sets = [self.trigrams(key) for key in comparable]
+        signatures = self.__signatures(trigram_sets)
+
+        for band in range(PublisherClusterer.BANDS):
+            start = band * PublisherClusterer.ROWS_PER_BAND
+            rows = np.ascontiguousarray(
+                signatures[:, start : start + PublisherClusterer.ROWS_PER_BAND]
+            )
+            buckets: dict[bytes, list[int]] = defaultdict(list)
+            for index, row in enumerate(map(bytes, rows)):
+                bucket = buckets[row]
+                for candidate in bucket[-PublisherClusterer.MAX_BUCKET_COMPARISONS :]:
+                    if (
+                        self.similarity(trigram_sets[candidate], trigram_sets[index])
+                        >= self.threshold
+                    ):
+                        self.__union(comparable[candidate], comparable[index])
+                bucket.append(index)
+
+        return {key: self.__find(key) for key in keys}
+
+    @staticmethod
+    def trigrams(key: str) -> frozenset[str]:
+        """
+        Computes the character trigrams of a key.
+
+        Args:
+            key (str): The dedup key.
+
+        Returns:
+            frozenset[str]: The trigrams.
+        """
+        return frozenset(key[i : i + 3] for i in range(len(key) - 2))
+
+    @staticmethod
+    def similarity(first: frozenset[str], second: frozenset[str]) -> float:
+        """
+        Computes the Jaccard similarity of two trigram sets.
+
+        Args:
+            first (frozenset[str]): The first trigram set.
+            second (frozenset[str]): The second trigram set.
+
+        Returns:
+            float: The similarity between 0 and 1.
+        """
+        shared = len(first & second)
+        return shared / (len(first) + len(second) - shared)
+
+    @staticmethod
+    def __signatures(trigram_sets: list[frozenset[str]]) -> np.ndarray:
+        """
+        Computes the MinHash signatures of the given trigram sets.
+
+        Args:
+            trigram_sets (list[frozenset[str]]): The non-empty trigram sets.
+
+        Returns:
+            np.ndarray: A matrix with a signature row for every set.
+        """
+        hash_count = PublisherClusterer.BANDS * PublisherClusterer.ROWS_PER_BAND
+        rng = np.random.default_rng(PublisherClusterer.SEED)
+        a = rng.integers(1, PublisherClusterer.PRIME, hash_count, dtype=np.uint64)
+        b = rng.integers(0, PublisherClusterer.PRIME, hash_count, dtype=np.uint64)
+
+        trigram_ids: dict[str, int] = {}
+        signatures = np.empty((len(trigram_sets), hash_count), dtype=np.uint32)
+        for start in range(0, len(trigram_sets), PublisherClusterer.CHUNK_SIZE):
+            chunk = trigram_sets[start : start + PublisherClusterer.CHUNK_SIZE]
+            ids = np.fromiter(
+                (
+                    trigram_ids.setdefault(trigram, len(trigram_ids))
+                    for trigrams in chunk
+                    for trigram in trigrams
+                ),
+                dtype=np.uint64,
+            )
+            offsets = np.cumsum([0] + [len(trigrams) for trigrams in chunk[:-1]])
+            hashes = (ids[:, None] * a + b) % np.uint64(PublisherClusterer.PRIME)
+            signatures[start : start + len(chunk)] = np.minimum.reduceat(
+                hashes, offsets, axis=0
+            )
+        return signatures
+
+    def __find(self, key: str) -> str:
+        """
+        Finds the representative key of a cluster, compressing the path to it.
+
+        Args:
+            key (str): A key of the cluster.
+
+        Returns:
+            str: The representative key.
+        """
+        root = key
+        while (parent := self.__parents[root]) != root:
+            root = parent
+        while (parent := self.__parents[key]) != root:
+            self.__parents[key] = root
+            key = parent
+        return root
+
+    def __union(self, first: str, second: str) -> None:
+        """
+        Merges the clusters of two keys, keeping the shorter representative.
+
+        Args:
+            first (str): A key of the first cluster.
+            second (str): A key of the second cluster.
+
+        Returns:
+            None
+        """
+        first, second = self.__find(first), self.__find(second)
+        if first != second:
+            root, child = sorted((first, second), key=lambda key: (len(key), key))
+            self.__parents[child] = root
@@ -0,0 +1,186 @@
+from string import punctuation, whitespace
+from typing import Callable, Iterable
+from functools import lru_cache
+
+import re
+
+
+class PublisherNormalizer:
+    """
+    Normalizes publisher names, memoizing every step since a few hundred
+    thousand distinct names repeat across tens of millions of editions.
+
+    Raw names are cleaned once per (name, transliteration) pair while the dump
+    is scanned. The dedup keys of the distinct cleaned names are computed in a
+    single batch when the publishers are written: every name is shortened,
+    split into word tokens once, and the tokens found in a frozenset stop-list
+    are dropped.
+
+    Attributes:
+        __clean (Callable): A function cleaning a raw publisher name.
+        __transliterate (Callable): A function transliterating a cleaned name to Ukrainian.
+        __names (dict[tuple[str, bool], str]): A dictionary mapping raw names and
+            transliteration flags to cleaned names.
+        __stemmer (PorterStemmer | None): The stemmer, created on first use.
+        __tokenizer (NLTKWordTokenizer | None): The word tokenizer, created on first use.
+    """
+
+    VERSION = "1"
+    UNKNOWN_PUBLISHER_NAME = "Other"
+    SHORTENED_NAME_MAX_LENGTH = 50
+    STEM_CACHE_SIZE = 1 << 16
+    BRACELESS_PUNCTUATION_WITH_SPACE = (
+        punctuation.translate(str.maketrans("", "", "(){}[]")) + whitespace
+    )
+
+    STOP_WORDS = frozenset(
+        (
+            "імені", "имени", "ім", "им", "університет", "інститут", "національний",
+            "національна", "нац", "державний", "державна", "у", "і", "й", "college",
+            "institute", "textbook", "textbooks", "books", "group", "incorporated", "inc",
+            "house", "illustrate", "australia", "united", "states", "usa", "us", "uk",
+            "canada", "india", "publications", "pubns", "publisher", "publishers",
+            "publishing", "pub", "primary", "secondary", "collection", "collections",
+            "communication", "communications", "company", "companies", "co", "imprints",
+            "imprint", "reprints", "reprint", "prints", "print", "press", "ltd",
+            "juvenile", "juv", "professional", "pro", "pr", "school", "educational",
+            "education", "division", "library", "interest", "international", "int",
+            "intrnl", "intl", "intnl", "literature", "txt", "general", "management",
+            "hall", "academy", "academies", "academic", "learning", "paperbacks",
+            "paperback", "bros", "home", "audio", "video", "multimedia", "media", "story",
+            "stories", "writer", "writers", "org", "organization", "panamerican",
+            "american", "america", "departments", "department", "archives", "archive",
+            "editions", "edition", "editorials", "editorial", "trade", "biblioteked",
+            "biblioteka", "biblioteke", "bbc", "junior", "with", "for", "llc", "vydvo",
+            "vyd-vo", "edu", "gp", "news", "university", "univ", "uni", "t-vo", "tvo",
+            "tovarystvo", "government", "govt", "gov", "the", "in", "of", "at", "an",
+            "a", "de", "et", "and",
+        )
+    )
+    ARTICLES = frozenset(("the", "a", "an", "de", "et", "in", "of", "at", "у", "і", "й"))
+
+    # Hyphenated stop words are the only tokens spanning a non-word character.
+    TOKEN_PATTERN = re.compile(r"\b(?:vyd-vo|t-vo)\b|\w+")
+    PUBLISHED_BY_PATTERN = re.compile(r"^\s*published by\s+", re.IGNORECASE)
+    BY_PATTERN = re.compile(r"\s+by\s+", re.IGNORECASE)
+    UNICODE_ESCAPE_PATTERN = re.compile(r"\\u\+\d{4}")
+
+    def __init__(
+        self, clean: Callable[[str], str], transliterate: Callable[[str], str]
+    ) -> None:
+        """
+        Initializes a PublisherNormalizer object.
+
+        Args:
+            clean (Callable): A function cleaning a raw publisher name.
+            transliterate (Callable): A function transliterating a cleaned name to Ukrainian.
+
+        Returns:
+            None
+        """
+        self.__clean = clean
+        self.__transliterate = transliterate
+        self.__names: dict[tuple[str, bool], str] = {}
+        self.__stemmer = None
+        self.__tokenizer = None
+
+        self.stem = lru_cache(maxsize=PublisherNormalizer.STEM_CACHE_SIZE)(self.__stem)
+        self.shorten = lru_cache(maxsize=None)(self.__shorten)
+
+    def clean(self, raw: str, ukrainian: bool = False) -> str:
+        """
+        Cleans a raw publisher name, transliterating it for Ukrainian editions.
+
+        Args:
+            raw (str): The publisher name as found in the dump.
+            ukrainian (bool): Whether the name belongs to a Ukrainian edition.
+
+        Returns:
+            str: The cleaned publisher name.
+        """
+        if (name := self.__names.get((raw, ukrainian))) is None:
+            name = self.__clean(raw)
+            if ukrainian and name != PublisherNormalizer.UNKNOWN_PUBLISHER_NAME:
+                name = self.__transliterate(name)
+            self.__names[(raw, ukrainian)] = name
+        return name
+
+    def keys(self, names: Iterable[str]) -> dict[str, str]:
+        """
+        Computes the dedup keys of a batch of distinct cleaned names.
+
+        Args:
+            names (Iterable[str]): The cleaned publisher names.
+
+        Returns:
+            dict[str, str]: A dictionary mapping every name to its dedup key.
+        """
+        return {name: self.key(self.shorten(name)) for name in names}
+
+    @staticmethod
+    def key(name: str) -> str:
+        """
+        Reduces a publisher name to its dedup key by dropping stop words and
+        every non-word character.
+
+        Args:
+            name (str): The shortened publisher name.
+
+        Returns:
+            str: The dedup key.
+        """
+        tokens = PublisherNormalizer.TOKEN_PATTERN.findall(name.lower())
+        if kept := [t for t in tokens if t not in PublisherNormalizer.STOP_WORDS]:
+            return "".join(kept)
+        return next(
+            (t for t in tokens if t not in PublisherNormalizer.ARTICLES),
+            tokens[0] if tokens else "",
+        ).replace("-", "")
+
+    def __shorten(self, name: str) -> str:
+        """
+        Shortens a publisher name to the maximum length by stemming its words.
+
+        Args:
+            name (str): The cleaned publisher name.
+
+        Returns:
+            str: The shortened name.
+        """
+        name = PublisherNormalizer.PUBLISHED_BY_PATTERN.sub("", name)
+        name = PublisherNormalizer.BY_PATTERN.split(name, 1)[0]
+        if len(name) <= PublisherNormalizer.SHORTENED_NAME_MAX_LENGTH:
+            return name
+
+        match = PublisherNormalizer.UNICODE_ESCAPE_PATTERN.search(name[:60])
+        name = name[: match.start()] if match and match.end() > 60 else name[:60]
+
+        if self.__tokenizer is None:
+            from nltk.tokenize import NLTKWordTokenizer
+
+            self.__tokenizer = NLTKWordTokenizer()
+        words = [
+            self.stem(w)
+            for w in self.__tokenizer.tokenize(
+                name.strip(PublisherNormalizer.BRACELESS_PUNCTUATION_WITH_SPACE)
+            )
+        ]
+        return " ".join(
+            w for w in words if len(w) + 1 <= PublisherNormalizer.SHORTENED_NAME_MAX_LENGTH
+        ).rstrip()
+
+    def __stem(self, word: str) -> str:
+        """
+        Stems a word with the shared Porter stemmer.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            str: The stem.
+        """
+        if self.__stemmer is None:
+            from nltk.stem import PorterStemmer
+
+            self.__stemmer = PorterStemmer()
+        return self.__stemmer.stem(word)
@@ -0,0 +1,196 @@
+from parsers.table_sink import TableSink
+
+from typing import Callable
+import hashlib
+import orjson
+import os
+
+
+class ShardedSink(TableSink):
+    """
+    Rotates the rows of a table into numbered shards and lists them in a manifest.
+
+    The shards are written by sinks of another type, e.g. `loan.00000.csv.gz`,
+    `loan.00001.csv.gz`, ... for the table path `loan.csv.gz`, and a new shard
+    is started once the current one holds `max_rows` rows or `max_bytes` bytes.
+    The byte size is checked against the size on disk every `CHECK_ROWS`
+    rows, so a shard can exceed it by about as many rows. Closing the sink
+    writes the manifest of the table next to it, with the file name, row
+    count, size and MD5 checksum of every shard, so that the shards can be
+    uploaded, verified and imported independently.
+
+    Attributes:
+        max_rows (int | None): The number of rows after which a shard is rotated.
+        max_bytes (int | None): The size after which a shard is rotated.
+        shards (list[dict]): The entries of the closed shards.
+    """
+
+    MANIFEST_SUFFIX = ".manifest.json"
+    SHARD_DIGITS = 5
+    CHUNK_SIZE = 1 << 20
+    CHECK_ROWS = 10_000
+
+    def __init__(
+        self,
+        open_shard: Callable[[str], TableSink],
+        path: str,
+        table: str,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        """
+        Initializes a ShardedSink object and opens its first shard.
+
+        Args:
+            open_shard (Callable[[str], TableSink]): Opens a sink of the table at a shard path.
+            path (str): The path of the table, from which the shard paths are derived.
+            table (str): The name of the table, a key of `TABLE_SCHEMAS`.
+            max_rows (int | None): The number of rows after which a shard is rotated.
+            max_bytes (int | None): The size after which a shard is rotated.
+
+        Returns:
+            None
+        """
+        TableSink.__init__(self, path, table)
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.shards: list[dict] = []
+        self.__open_shard = open_shard
+        self.__sink = open_shard(self.shard_path(path, 0))
+
+    @staticmethod
+    def shard_path(path: str, index: int) -> str:
+        """
+        Builds the path of a shard by numbering the file name after the table name.
+
+        Args:
+            path (str): The path of the table.
+            index (int): The number of the shard.
+
+        Returns:
+            str: The path of the shard.
+        """
+        name_start = max(path.rfind("\\"), path.rfind("/")) + 1
+        extension_start = path.find(".", name_start)
+        if extension_start == -1:
+            extension_start = len(path)
+        return (
+            f"{path[:extension_start]}.{index:0{ShardedSink.SHARD_DIGITS}d}"
+            f"{path[extension_start:]}"
+        )
+
+    @staticmethod
+    def manifest_path(path: str) -> str:
+        """
+        Returns the path of the manifest of a table.
+
+        Args:
+            path (str): The path of the table.
+
+        Returns:
+            str: The path of the manifest.
+        """
+        return f"{path}{ShardedSink.MANIFEST_SUFFIX}"
+
+    @staticmethod
+    def read_shards(path: str) -> list[dict]:
+        """
+        Lists the shards of a table from its manifest, or the table file itself
+        as a single shard when it was not sharded.
+
+        Args:
+            path (str): The path of the table.
+
+        Returns:
+            list[dict]: The path, row count (None if unknown), size and MD5
+                checksum of every shard.
+        """
+        manifest_path = ShardedSink.manifest_path(path)
+        if not os.path.exists(manifest_path):
+            return [
+                {
+                    "path": path,
+                    "rows": None,
+                    "bytes": os.path.getsize(path),
+                    "md5": ShardedSink.md5(path),
+                }
+            ]
+
+        with open(manifest_path, "rb") as f:
+            manifest = orjson.loads(f.read())
+        directory = path[: max(path.rfind("\\"), path.rfind("/")) + 1]
+        return [
+            {"path": f"{directory}{shard['file']}", **shard} for shard in manifest["shards"]
+        ]
+
+    @staticmethod
+    def md5(path: str) -> str:
+        """
+        Computes the MD5 checksum of a file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            str: The hexadecimal checksum.
+        """
+        digest = hashlib.md5()
+        with open(path, "rb") as f:
+            while chunk := f.read(ShardedSink.CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _write_block(self, rows: list[tuple]) -> None:
+        start = 0
+        while start < len(rows):
+            if self.__is_full():
+                self.__finish_shard()
+                self.__sink = self.__open_shard(self.shard_path(self.path, len(self.shards)))
+
+            end = len(rows)
+            if self.max_rows is not None:
+                end = min(end, start + self.max_rows - self.__sink.rows)
+            if self.max_bytes is not None:
+                end = min(end, start + ShardedSink.CHECK_ROWS)
+            self.__sink.extend(rows[start:end])
+            self.__sink.flush()
+            start = end
+
+    def _close(self) -> None:
+        self.__finish_shard()
+        manifest = {
+            "table": self.table,
+            "rows": sum(shard["rows"] for shard in self.shards),
+            "shards": self.shards,
+        }
+        with open(self.manifest_path(self.path), "wb") as f:
+            f.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+
+    def __is_full(self) -> bool:
+        """
+        Checks whether the current shard reached its row count or size limit.
+
+        Returns:
+            bool: Whether a new shard has to be started.
+        """
+        return (self.max_rows is not None and self.__sink.rows >= self.max_rows) or (
+            self.max_bytes is not None and os.path.getsize(self.__sink.path) >= self.max_bytes
+        )
+
+    def __finish_shard(self) -> None:
+        """
+        Closes the current shard and adds its entry to the manifest.
+
+        Returns:
+            None
+        """
+        self.__sink.close()
+        path = self.__sink.path
+        self.shards.append(
+            {
+                "file": path[max(path.rfind("\\"), path.rfind("/")) + 1 :],
+                "rows": self.__sink.rows,
+                "bytes": os.path.getsize(path),
+                "md5": self.md5(path),
+            }
+        )
@@ -2,12 +2,14 @@ from parsers.abstract_parser import AbstractParser
 from parsers.user_manager import UserManager
 from .abstract_parser import AbstractParser
 from parsers.file_writer import FileWriter
+from parsers.item_scheduler import ItemScheduler
+from parsers.table_sink import TableSink
 
-from datetime import datetime, timedelta
-from io import TextIOWrapper
+from datetime import datetime
+from array import array
 
+import numpy as np
 import itertools
-import calendar
 import sqlite3
 import orjson
 import random
@@ -22,6 +24,8 @@ class SLDataParser(AbstractParser, FileWriter):
     process SL data files.
     """
 
+    GROUP_BATCH_SIZE = 10_000
+
     def __init__(
         self, conn: sqlite3.Connection, file_type: str, user_manager: UserManager
     ) -> None:
@@ -38,12 +42,12 @@ class SLDataParser(AbstractParser, FileWriter):
         AbstractParser.__init__(self, user_manager, conn)
         FileWriter.__init__(self, file_type)
 
-        self.__loans = []
-        self.__items_maxxing = {}
+        self.__init_checkouts()
         self.__work_isbns = {}
 
         self.__loan_id = itertools.count(1)
         self.__inventory_id = itertools.count(1)
+        self.__rng = np.random.default_rng()
 
     def process_file(self, input_file: str, output_files: list[str]) -> list[str]:
         """
@@ -62,17 +66,18 @@ class SLDataParser(AbstractParser, FileWriter):
         directory = output_files[1].rpartition("\\")[0]
         item_out_location = directory + f"\\inventory_item.{self.type_name}"
         os.makedirs(rf"{directory}", exist_ok=True)
-        with open(input_file, "r", encoding="utf-8") as f_in, open(
-            output_files[0], "w", encoding="utf-8", newline=""
-        ) as loan_out, open(
-            output_files[1], "w", encoding="utf-8", newline=""
-        ) as return_out, open(
-            item_out_location, "w", encoding="utf-8", newline=""
+        with open(input_file, "r", encoding="utf-8") as f_in, self.open_sink(
+            output_files[0], "loan"
+        ) as loan_out, self.open_sink(
+            output_files[1], "loan_return"
+        ) as return_out, self.open_sink(
+            item_out_location, "inventory_item"
         ) as item_out:
             print(f"Reading file '{input_file}'- {datetime.now().isoformat()}", flush=True)
             while True:
                 if not (lines := list(itertools.islice(f_in, CHUNK_SIZE))):
                     break
+                rows = []
                 for line in lines:
                     try:
                         line = (
@@ -82,11 +87,23 @@ class SLDataParser(AbstractParser, FileWriter):
                             .replace(r"\\\\", r"\\")
                         )
 
-                        data = orjson.loads(line)
-                        self.__parse_line(data)
+                        if isinstance(data := orjson.loads(line), dict):
+                            rows.append(data)
+                    except Exception:
+                        continue
+                self.isbn_normalizer.resolve(
+                    isbn
+                    for row in rows
+                    if isinstance(row.get("isbn"), str)
+                    for isbn in self.__split_isbns(row)
+                )
+                for row in rows:
+                    try:
+                        self.__parse_line(row)
                     except Exception:
                         continue
             self.process_data(item_out, loan_out, return_out)
+        self.print_write_stats([loan_out, return_out, item_out])
         self.clear_up()
         return [item_out_location] + output_files
 
@@ -105,8 +122,7 @@ class SLDataParser(AbstractParser, FileWriter):
         checkouts = int(line.get("checkouts", 0))
         material_type = line.get("materialtype", None)
 
-        split_isbns = [isbn.strip(" '") for isbn in line.get("isbn").split(",")]
-        isbns = self.convert_to_isbn13(split_isbns)
+        isbns = self.convert_to_isbn13(self.__split_isbns(line))
 
         for isbn in isbns:
             if work_id := self.__work_isbns.get(isbn):
@@ -114,51 +130,100 @@ class SLDataParser(AbstractParser, FileWriter):
         else:
             return
 
-        self.__loans.append(
-            {
-                "checkout_year": checkoutyear,
-                "checkout_month": checkoutmonth,
-                "checkouts": checkouts,
-                "work_id": work_id,
-            }
+        if (material := self.__material_codes.get(material_type)) is None:
+            material = self.__material_codes[material_type] = len(self.__material_codes)
+            self.__material_types.append(material_type)
+
+        self.__work_ids.append(work_id)
+        self.__years.append(checkoutyear)
+        self.__months.append(checkoutmonth)
+        self.__checkouts.append(checkouts)
+        self.__materials.append(material)
+
+    def __init_checkouts(self) -> None:
+        """
+        Initializes the columnar state of the matched checkout rows.
+
+        Every matched row is appended to compact typed arrays instead of a list
+        of dictionaries, and the material types are stored as small codes.
+
+        Returns:
+            None
+        """
+        self.__work_ids = array("i")
+        self.__years = array("h")
+        self.__months = array("b")
+        self.__checkouts = array("i")
+        self.__materials = array("h")
+        self.__material_codes: dict[str | None, int] = {}
+        self.__material_types: list[str | None] = []
+
+    def __aggregate_items(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Aggregates the matched checkout rows into the item quantity and material
+        type of every work.
+
+        A work's material type is that of its last row. Its quantity is the
+        largest number of checkouts of its book rows after its last non-book
+        row, or 1 if it has a non-book row but no later book row.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The distinct work IDs,
+                their item quantities and their material codes.
+        """
+        work_ids, inverse = np.unique(
+            np.frombuffer(self.__work_ids, dtype=np.int32), return_inverse=True
         )
+        checkouts = np.frombuffer(self.__checkouts, dtype=np.int32)
+        materials = np.frombuffer(self.__materials, dtype=np.int16)
+        rows = np.arange(len(inverse))
 
-        self.__items_maxxing[work_id] = {
-            "qty": (
-                max(
-                    self.__items_maxxing.get(work_id, {}).get("qty", 0),
-                    checkouts,
-                )
-                if material_type == "BOOK"
-                else 1
-            ),
-            "material_type": material_type,
-        }
+        last_row = np.full(len(work_ids), -1)
+        np.maximum.at(last_row, inverse, rows)
+
+        is_book = materials == self.__material_codes.get("BOOK", -1)
+        last_other_row = np.full(len(work_ids), -1)
+        np.maximum.at(last_other_row, inverse[~is_book], rows[~is_book])
+
+        qty = np.where(last_other_row >= 0, 1, 0)
+        counted = is_book & (rows > last_other_row[inverse])
+        np.maximum.at(qty, inverse[counted], checkouts[counted])
+        return work_ids, qty, materials[last_row]
+
+    @staticmethod
+    def __split_isbns(line: dict) -> list[str]:
+        """
+        Splits the comma-separated ISBNs of a line.
+
+        Args:
+            line (dict): The JSON data of the line.
+
+        Returns:
+            list[str]: The raw ISBNs.
+        """
+        return [isbn.strip(" '") for isbn in (line.get("isbn") or "").split(",")]
 
     def process_data(
         self,
-        item_out: TextIOWrapper,
-        loan_out: TextIOWrapper,
-        return_out: TextIOWrapper,
+        item_out: TableSink,
+        loan_out: TableSink,
+        return_out: TableSink,
     ):
         """
         Process data to generate items, loans, and loan returns.
 
         Args:
-            item_out (TextIOWrapper): Output file for items.
-            loan_out (TextIOWrapper): Output file for loans.
-            return_out (TextIOWrapper): Output file for loan returns.
+            item_out (TableSink): Output table for items.
+            loan_out (TableSink): Output table for loans.
+            return_out (TableSink): Output table for loan returns.
         """
-        CHUNK_SIZE = 1001
-
         items = []
-        loans = []
-        returns = []
-        items_ids = {}
-        for work_id in list(self.__items_maxxing.keys()):
-            item = self.__items_maxxing[work_id]
-            qty = item.get("qty")
-            material_type = item.get("material_type")
+        schedulers = {}
+        work_ids, quantities, materials = self.__aggregate_items()
+        for work_id, qty, material in zip(
+            work_ids.tolist(), quantities.tolist(), materials.tolist()
+        ):
+            material_type = self.__material_types[material]
 
             checkouts = (
                 1 if material_type in ['EBOOK', 'AUDIOBOOK'] else
@@ -173,74 +238,121 @@ class SLDataParser(AbstractParser, FileWriter):
                 ids.append(id)
                 items.append((id, work_id, material_type))
 
-            items_ids[work_id] = ids
-            ids = []
-            del self.__items_maxxing[work_id]
-
-        for item in self.__loans:
-            checkoutyear = item.get("checkout_year")
-            checkoutmonth = item.get("checkout_month")
-            work_id = item.get("work_id")
-            ids = items_ids[work_id]
-
-            for i in range(0, item.get("checkouts")):
-                random.shuffle(ids)
-
-                loaned_at = datetime(
-                    checkoutyear,
-                    checkoutmonth,
-                    random.randint(
-                        1, calendar.monthrange(checkoutyear, checkoutmonth)[1]
-                    ),
-                    random.randint(0, 23),
-                    random.randint(0, 59),
-                    random.randint(0, 59),
-                    random.randint(0, 999999),
-                )
-                if not (loan_id := next(self.__loan_id)):
-                    return None
+            schedulers[work_id] = ItemScheduler(ids)
+
+        self.__write_to_files(loan_out, item_out, return_out, [], items, [])
+
+        # Items are scheduled in chronological order of the loans, so every batch
+        # holds whole months, whose loans are sorted across their rows.
+        work_ids = np.frombuffer(self.__work_ids, dtype=np.int32)
+        years = np.frombuffer(self.__years, dtype=np.int16).astype(np.int64)
+        months = np.frombuffer(self.__months, dtype=np.int8).astype(np.int64)
+        checkouts = np.frombuffer(self.__checkouts, dtype=np.int32)
+        order = np.lexsort((months, years))
+        month_keys = (years * 12 + months)[order]
+        start = 0
+        while start < len(order):
+            end = min(start + SLDataParser.GROUP_BATCH_SIZE, len(order))
+            end = int(np.searchsorted(month_keys, month_keys[end - 1], side="right"))
+            groups = order[start:end]
+            start = end
+            group, loaned_at, returned_at, returned = self.synthesize_timestamps(
+                years[groups], months[groups], checkouts[groups], self.__rng
+            )
+            if not (count := len(group)):
+                continue
+            chronological = np.argsort(loaned_at, kind="stable")
+            group, loaned_at, returned_at, returned = (
+                group[chronological],
+                loaned_at[chronological],
+                returned_at[chronological],
+                returned[chronological],
+            )
 
-                loan = (
-                    loan_id,
-                    self.user_manager.get_or_generate_reader(),
-                    ids[i % len(ids)],
-                    loaned_at.isoformat(),
+            loan_ids = list(itertools.islice(self.__loan_id, count))
+            work_schedulers = [schedulers[w] for w in work_ids[groups][group].tolist()]
+            item_ids = [
+                scheduler.assign(loaned, returned_key)
+                for scheduler, loaned, returned_key in zip(
+                    work_schedulers,
+                    loaned_at.view(np.int64).tolist(),
+                    np.where(
+                        returned, returned_at.view(np.int64), ItemScheduler.NEVER_RETURNED
+                    ).tolist(),
                 )
+            ]
 
-                if random.randint(0, 100_000) != 99_999:
-                    loan_return = (
-                        loan[0],
-                        (
-                            loaned_at
-                            + timedelta(
-                                days=random.randint(1, 14),
-                                hours=random.randint(0, 23),
-                                minutes=random.randint(0, 59),
-                            )
-                        ).isoformat(),
-                    )
-                    returns.append(loan_return)
-
-                loans.append(loan)
-
-                if len(loans) == CHUNK_SIZE:
-                    self.__write_to_files(loan_out, item_out, return_out, loans, items, returns)
-                    loans.clear()
-                    items.clear()
-                    returns.clear()
-        self.__write_to_files(loan_out, item_out, return_out, loans, items, returns)
+            loans = zip(
+                loan_ids,
+                self.user_manager.get_or_generate_readers(count).tolist(),
+                item_ids,
+                np.datetime_as_string(loaned_at, unit="us").tolist(),
+            )
+            returns = zip(
+                itertools.compress(loan_ids, returned.tolist()),
+                np.datetime_as_string(returned_at[returned], unit="us").tolist(),
+            )
+            self.__write_to_files(loan_out, item_out, return_out, loans, [], returns)
+        print(
+            f"Assigned {sum(scheduler.loans for scheduler in schedulers.values())} loans, "
+            f"{sum(scheduler.conflicts for scheduler in schedulers.values())} to items on loan"
+            f" - {datetime.now().isoformat()}",
+            flush=True,
+        )
+
+    @staticmethod
+    def synthesize_timestamps(
+        years: np.ndarray,
+        months: np.ndarray,
+        checkouts: np.ndarray,
+        rng: np.random.Generator,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draws the loan and return times of a batch of monthly checkout groups.
+
+        Every loan falls at a uniformly random microsecond of its month, and is
+        returned 1 to 14 days, 0 to 23 hours and 0 to 59 minutes later, except for
+        about one loan in 100000 which is never returned.
+
+        Args:
+            years (np.ndarray): The checkout year of every group.
+            months (np.ndarray): The checkout month of every group.
+            checkouts (np.ndarray): The number of checkouts of every group.
+            rng (np.random.Generator): The random generator.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The group index
+                of every loan, its datetime64 loan and return times, sorted by loan
+                time within every group, and whether it is returned.
+        """
+        month_starts = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+        starts = month_starts.astype("datetime64[us]")
+        spans = (month_starts + 1).astype("datetime64[us]") - starts
+
+        group = np.repeat(np.arange(len(checkouts)), checkouts)
+        offsets = (rng.random(len(group)) * spans[group].astype(np.int64)).astype(np.int64)
+        loaned_at = starts[group] + offsets.astype("timedelta64[us]")
+        loaned_at = loaned_at[np.lexsort((loaned_at, group))]
+
+        minutes = (
+            rng.integers(1, 14, len(group), endpoint=True) * 24 * 60
+            + rng.integers(0, 23, len(group), endpoint=True) * 60
+            + rng.integers(0, 59, len(group), endpoint=True)
+        )
+        returned_at = loaned_at + minutes.astype("timedelta64[m]")
+        returned = rng.integers(0, 100_000, len(group), endpoint=True) != 99_999
+        return group, loaned_at, returned_at, returned
 
     def __write_to_files(self, loan_out, item_out, return_out, loans, items, returns):
-        self._tuple_write_strategy(loan_out, loans)
-        self._tuple_write_strategy(item_out, items)
-        self._tuple_write_strategy(return_out, returns)
+        loan_out.extend(loans)
+        item_out.extend(items)
+        return_out.extend(returns)
 
     def clear_up(self):
         """
-        Clears the loans list and resets the items_maxxing dictionary.
+        Clears the columnar state of the matched checkout rows.
         """
-        self.__loans = []
-        self.__items_maxxing = {}
+        self.__init_checkouts()
         self.cursor.close()
 
     def __load_work_ids(self):
@@ -0,0 +1,142 @@
+from parsers.table_sink import TABLE_SORT_KEYS, TableSink
+
+from itertools import islice
+from operator import itemgetter
+from typing import IO, Iterator
+import tempfile
+import pickle
+import heapq
+
+import numpy as np
+
+
+class SortedSink(TableSink):
+    """
+    Writes the rows of a table to another sink ordered by a clustering key.
+
+    The rows are collected in memory, and once `max_rows_in_memory` rows are
+    held, they are sorted, with NumPy when the key columns are integers, and
+    spilled to a temporary file as a sorted run. Closing the sink writes the
+    rows in order to the wrapped sink, directly from memory when nothing was
+    spilled and otherwise by merging the runs, so tables larger than memory
+    are sorted externally.
+
+    Attributes:
+        sink (TableSink): The wrapped sink.
+        key_columns (tuple[str, ...]): The columns the rows are ordered by.
+        runs (int): The number of sorted runs spilled to disk.
+    """
+
+    MAX_ROWS_IN_MEMORY = 1_000_000
+    SPILL_CHUNK_SIZE = 10_000
+
+    def __init__(
+        self,
+        sink: TableSink,
+        key_columns: tuple[str, ...] | None = None,
+        max_rows_in_memory: int = MAX_ROWS_IN_MEMORY,
+    ) -> None:
+        """
+        Initializes a SortedSink object.
+
+        Args:
+            sink (TableSink): The sink the ordered rows are written to.
+            key_columns (tuple[str, ...] | None): The columns the rows are
+                ordered by, by default the primary key in `TABLE_SORT_KEYS`,
+                which is required for the other tables.
+            max_rows_in_memory (int): The number of rows sorted in memory
+                before they are spilled as a run.
+
+        Returns:
+            None
+        """
+        TableSink.__init__(self, sink.path, sink.table)
+        self.sink = sink
+        self.schema = sink.schema
+        self.key_columns = key_columns or TABLE_SORT_KEYS[sink.table]
+        self.runs = 0
+        names = [name for name, _ in self.columns]
+        self.__key_indices = [names.index(column) for column in self.key_columns]
+        self.__key = itemgetter(*self.__key_indices)
+        self.__max_rows_in_memory = max_rows_in_memory
+        self.__rows: list[tuple] = []
+        self.__run_files: list[IO[bytes]] = []
+
+    def _write_block(self, rows: list[tuple]) -> None:
+        start = 0
+        while start < len(rows):
+            end = start + self.__max_rows_in_memory - len(self.__rows)
+            self.__rows.extend(rows[start:end])
+            if len(self.__rows) >= self.__max_rows_in_memory:
+                self.__spill()
+            start = end
+
+    def _close(self) -> None:
+        try:
+            if self.__run_files:
+                if self.__rows:
+                    self.__spill()
+                rows = heapq.merge(
+                    *(self.__read_run(run_file) for run_file in self.__run_files), key=self.__key
+                )
+            else:
+                rows = iter(self.__sorted_rows())
+
+            while block := list(islice(rows, TableSink.BUFFER_SIZE)):
+                self.sink.extend(block)
+            self.sink.close()
+        finally:
+            self.__rows = []
+            for run_file in self.__run_files:
+                run_file.close()
+
+    def __sorted_rows(self) -> list[tuple]:
+        """
+        Sorts the rows held in memory by the key, with a NumPy lexicographic
+        sort of the key columns when they are all integers.
+
+        Returns:
+            list[tuple]: The sorted rows.
+        """
+        rows = self.__rows
+        keys = [np.array([row[index] for row in rows]) for index in reversed(self.__key_indices)]
+        if not rows or any(key.dtype.kind not in "iu" for key in keys):
+            return sorted(rows, key=self.__key)
+        return [rows[index] for index in np.lexsort(keys).tolist()]
+
+    def __spill(self) -> None:
+        """
+        Sorts the rows held in memory and writes them to a temporary file as a run.
+
+        Returns:
+            None
+        """
+        rows = self.__sorted_rows()
+        run_file = tempfile.TemporaryFile()
+        for start in range(0, len(rows), SortedSink.SPILL_CHUNK_SIZE):
+            pickle.dump(
+                rows[start : start + SortedSink.SPILL_CHUNK_SIZE],
+                run_file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        run_file.seek(0)
+        self.__run_files.append(run_file)
+        self.__rows = []
+        self.runs += 1
+
+    @staticmethod
+    def __read_run(run_file: IO[bytes]) -> Iterator[tuple]:
+        """
+        Reads the rows of a sorted run.
+
+        Args:
+            run_file (IO[bytes]): The temporary file of the run.
+
+        Yields:
+            tuple: The rows of the run, in order.
+        """
+        while True:
+            try:
+                yield from pickle.load(run_file)
+            except EOFError:
+                return
@@ -0,0 +1,141 @@
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+class SubjectClassifier:
+    """
+    Classifies free-form subject strings onto the library subjects.
+
+    Every string is embedded with the sentence vectors of the given model and
+    assigned to the subject of its most similar theme word. Similarities of a
+    whole batch are computed with a single product of unit-normalized matrices.
+    The model is loaded on the first classification.
+
+    Attributes:
+        subjects (list[str]): The names of the library subjects.
+        themes (list[str]): The distinct theme words.
+        __model_loader (Callable): A function returning the embedding model.
+        __theme_subjects (np.ndarray): Subject index of every theme word.
+        __theme_matrix (np.ndarray | None): Unit-normalized theme word vectors.
+    """
+
+    SUBJECTS_TO_THEMES: Dict[str, List[str]] = {
+        "Action & Adventure": ["action", "adventure", "thrill", "exciting", "heroic" "quest", "fight", "treasure"],
+        "Fantasy": ["magic", "fantasy", "wizard", "dragon"],
+        "Science Fiction": ["space", "alien", "technology", "future", "robot"],
+        "Dystopian": ["dystopia", "apocalypse", "totalitarian", "rebellion"],
+        "Mystery": ["detective", "crime", "mystery"],
+        "Horror": ["horror", "scary", "supernatural", "haunted", "monsters"],
+        "Romance": ["love", "relationship", "heartbreak", "passion", "soulmate"],
+        "LGBTQ+": ["lgbtq", "gay", "lesbian", "queer", "identity"],
+        "Contemporary Fiction": ["modern", "realistic", "current", "society"],
+        "Young Adult": ["young", "teen", "adolescent", "coming-of-age"],
+        "Graphic Novel": ["graphic", "comic", "illustrated", "visual"],
+        "Children's": ["children", "kids", "friendship", "lessons"],
+        "Biography": ["biography", "life", "person", "memoir"],
+        "Food & Drink": ["food", "drink", "cooking", "cuisine", "recipe"],
+        "Art & Photography": ["art", "photography", "visual", "creative"],
+        "History & Travel": ["history", "travel", "culture", "explore"],
+        "True Crime": ["crime", "investigation", "murder", "justice", "victim"],
+        "Religion & Spirituality": ["religion", "spirituality", "faith"],
+        "Humanities & Social Sciences": ["humanities","society","behavior","identity"],
+        "Science & Technology": ["science", "technology", "research"],
+    }
+    BATCH_SIZE = 10_000
+    VERSION = "1"
+
+    def __init__(self, model_loader: Callable) -> None:
+        """
+        Initializes a SubjectClassifier object.
+
+        Args:
+            model_loader (Callable): A function returning a model that provides
+                `get_sentence_vector(text)`, e.g. a fastText model.
+
+        Returns:
+            None
+        """
+        self.__model_loader = model_loader
+        self.__model = None
+        self.subjects = list(SubjectClassifier.SUBJECTS_TO_THEMES.keys())
+
+        themes_to_subjects = {
+            theme: index
+            for index, themes in enumerate(SubjectClassifier.SUBJECTS_TO_THEMES.values())
+            for theme in themes
+        }
+        self.themes = list(themes_to_subjects.keys())
+        self.__theme_subjects = np.array(list(themes_to_subjects.values()))
+        self.__theme_matrix = None
+
+    @property
+    def model(self):
+        """
+        The embedding model, loaded on first use.
+
+        Returns:
+            The model returned by the model loader.
+        """
+        if self.__model is None:
+            self.__model = self.__model_loader()
+        return self.__model
+
+    def classify(self, texts: list[str]) -> np.ndarray:
+        """
+        Classifies the given texts onto the library subjects.
+
+        Texts without any known word get a random subject.
+
+        Args:
+            texts (list[str]): The preprocessed subject strings.
+
+        Returns:
+            np.ndarray: The subject index of every text.
+        """
+        if self.__theme_matrix is None:
+            self.__theme_matrix = self.__normalize(self.__embed(self.themes))
+
+        result = np.empty(len(texts), dtype=np.int64)
+        for start in range(0, len(texts), SubjectClassifier.BATCH_SIZE):
+            vectors = self.__normalize(
+                self.__embed(texts[start : start + SubjectClassifier.BATCH_SIZE])
+            )
+            subjects = self.__theme_subjects[
+                (vectors @ self.__theme_matrix.T).argmax(axis=1)
+            ]
+
+            unknown = ~vectors.any(axis=1)
+            subjects[unknown] = self.__theme_subjects[
+                np.random.randint(len(self.themes), size=int(unknown.sum()))
+            ]
+            result[start : start + len(subjects)] = subjects
+        return result
+
+    def __embed(self, texts: list[str]) -> np.ndarray:
+        """
+        Embeds the given texts with the model's sentence vectors.
+
+        Args:
+            texts (list[str]): The texts to embed.
+
+        Returns:
+            np.ndarray: A matrix with a row for every text.
+        """
+        return np.array(
+            [self.model.get_sentence_vector(text) for text in texts], dtype=np.float32
+        ).reshape(len(texts), -1)
+
+    @staticmethod
+    def __normalize(matrix: np.ndarray) -> np.ndarray:
+        """
+        Scales the rows of a matrix to unit length, leaving zero rows untouched.
+
+        Args:
+            matrix (np.ndarray): The matrix to normalize.
+
+        Returns:
+            np.ndarray: The normalized matrix.
+        """
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
@@ -0,0 +1,122 @@
+from string import punctuation, whitespace
+from typing import Iterable
+from html import unescape
+
+import re
+
+
+class TitleNormalizer:
+    """
+    Builds the normalized titles of editions.
+
+    A title is built from the edition's prefix, title and subtitle, HTML
+    entities and quotes are removed, bracket characters are dropped and
+    whitespace is collapsed. Most titles contain no entity, bracket or unusual
+    whitespace, so they take a fast path that only strips the separators.
+    The other titles go through precompiled patterns, and brackets are matched
+    by visiting the bracket characters only instead of every character.
+    """
+
+    REMOVALS_PATTERN = re.compile(
+        "|".join(
+            map(
+                re.escape,
+                ["&NewLine", "&#13", "&#10", "&#10;", "&#13;", '"', "&quot;", "\\"],
+            )
+        )
+    )
+    BRACELESS_PUNCTUATION_WITH_SPACE = (
+        punctuation.translate(str.maketrans("", "", "(){}[]")) + whitespace
+    )
+    OPENING_TO_CLOSING_PARENTHESES = {"(": ")", "[": "]", "{": "}"}
+    CLOSING_TO_OPENING_PARENTHESES = {
+        v: k for k, v in OPENING_TO_CLOSING_PARENTHESES.items()
+    }
+    BRACKETS_PATTERN = re.compile(r"[()\[\]{}]")
+    WHITESPACE_PATTERN = re.compile(r"[{}]+\s*|\s+")
+    # Anything the slow path would change besides stripping the ends.
+    SLOW_PATH_PATTERN = re.compile(r"[&\"\\()\[\]{}]|\s\s|[^\S ]")
+
+    @staticmethod
+    def build(obj: dict) -> str:
+        """
+        Builds the normalized title of an edition.
+
+        Args:
+            obj (dict): The edition object.
+
+        Returns:
+            str: The normalized title with its first character capitalized.
+        """
+        title = "{}. {}: {}".format(
+            obj.get("title_prefix", ""), obj.get("title", ""), obj.get("subtitle", "")
+        )
+        if TitleNormalizer.SLOW_PATH_PATTERN.search(title):
+            title = TitleNormalizer.collapse(TitleNormalizer.html_escape(title))
+        else:
+            title = title.strip(TitleNormalizer.BRACELESS_PUNCTUATION_WITH_SPACE)
+        return title[:1].upper() + title[1:]
+
+    @staticmethod
+    def build_many(objs: Iterable[dict]) -> list[str]:
+        """
+        Builds the normalized titles of a batch of editions.
+
+        Args:
+            objs (Iterable[dict]): The edition objects.
+
+        Returns:
+            list[str]: The normalized titles, in the order of the editions.
+        """
+        build = TitleNormalizer.build
+        return [build(obj) for obj in objs]
+
+    @staticmethod
+    def html_escape(s: str) -> str:
+        """
+        Escapes HTML entities in a string.
+
+        Args:
+            s (str): The string to escape.
+
+        Returns:
+            str: The escaped string.
+        """
+        s = TitleNormalizer.REMOVALS_PATTERN.sub("", s)
+        s = unescape(s)
+        return s.strip(TitleNormalizer.BRACELESS_PUNCTUATION_WITH_SPACE).replace('"', "'")
+
+    @staticmethod
+    def collapse(s: str) -> str:
+        """
+        Removes the opening brackets and the closing brackets that match them,
+        replaces the remaining closing braces and every whitespace run with a
+        single space, and strips the result.
+
+        Args:
+            s (str): The string to collapse.
+
+        Returns:
+            str: The collapsed string.
+        """
+        if brackets := list(TitleNormalizer.BRACKETS_PATTERN.finditer(s)):
+            stack = []
+            removed = []
+            for match in brackets:
+                c = match.group()
+                if c in TitleNormalizer.OPENING_TO_CLOSING_PARENTHESES:
+                    stack.append(c)
+                    removed.append(match.start())
+                elif stack and stack[-1] == TitleNormalizer.CLOSING_TO_OPENING_PARENTHESES[c]:
+                    stack.pop()
+                    removed.append(match.start())
+
+            kept = []
+            start = 0
+            for position in removed:
+                kept.append(s[start:position])
+                start = position + 1
+            kept.append(s[start:])
+            s = "".join(kept)
+
+        return TitleNormalizer.WHITESPACE_PATTERN.sub(" ", s).strip()
@@ -0,0 +1,230 @@
+from functools import lru_cache
+from string import punctuation, whitespace
+from transliterate.utils import get_language_pack
+
+import re
+
+
+class UkrainianTransliterator:
+    """
+    Transliterates romanized Ukrainian titles and publisher names back to
+    Ukrainian Cyrillic.
+
+    The letter mapping and the multi-letter rules of the `transliterate`
+    package's Ukrainian pack used to be applied as one `str.replace` per
+    entry, in order. They are compiled into a single alternation that applies
+    every entry in one pass, longest match first, followed by the pack's
+    single-letter translation table. Where entries overlap, applying them in
+    order can give a different result than a single pass, so the table is
+    extended with composite keys, e.g. 'yia' maps to 'yя' because 'ia' is
+    replaced before 'yi'. Those keys are found when the transliterator is
+    created by comparing both ways on every overlap of two keys. Results are
+    memoized per input string.
+
+    Attributes:
+        __steps (list[tuple[str, str]]): The replacements in the order they used to be applied.
+        __translation_table (dict[int, str]): The single-letter translation table.
+        __table (dict[str, str]): The replacement of every key of the alternation.
+        __pattern (re.Pattern): The alternation of all keys, longest first.
+    """
+
+    LETTERS_MAPPING: dict[str, str] = {
+        "SHCH": "Щ",
+        "shch": "щ",
+        "yï": "иї",
+        "i͡a︡": "я",
+        "i︠a︡": "я",
+        "i͡a": "я",
+        "ia︡": "я",
+        "íà": "я",
+        "i͡u︡": "ю",
+        "i︠u︡": "ю",
+        "i͡u": "ю",
+        "i͡e︡": "є",
+        "i︠e︡": "є",
+        "i͡e": "є",
+        "i︠e": "є",
+        "ĭ": "й",
+        "ĭ": "й",
+        "i︠︡": "i",
+        "z͡h︡": "ж",
+        "z︠h︡": "ж",
+        "z͡h": "ж",
+        "t͡s︡": "ц",
+        "t︠s︡": "ц",
+        "t͡s": "ц",
+        "t︠s︠": "ц",
+        "I͡A︡": "Я",
+        "І︠А︡": "Я",
+        "I︠A︡": "Я",
+        "I͡A": "Я",
+        "І︠а︡": "Я",
+        "I︠a︡": "Я",
+        "І︠У︡": "Ю",
+        "I͡U︡": "Ю",
+        "I︠U︡": "Ю",
+        "I͡U": "Ю",
+        "I͡u": "Ю",
+        "I͡E︡": "Є",
+        "І︠Е︡": "Є",
+        "I͡E": "Є",
+        "Z͡H︡": "Ж",
+        "Z︠H︡": "Ж",
+        "T͡S︡": "Ц",
+        "T︠S︡": "Ц",
+        "T͡S": "Ц",
+        "/︠ ": "/ ",
+        "--": "–",
+        "ʹ'": "ь",
+        "ʹ": "ь",
+        "'": "ь",
+        "w": "в",
+        "W": "В",
+        "ł": "в",
+        "Ł": "В",
+        "č": "ч",
+        "Č": "Ч",
+        "ǹ": "ьн",
+        "n̆": "ьн",
+        "š": "ш",
+        "ö": "е",
+        "i͏̈": "ї",
+        "ia": "я",
+        "ie": "є",
+        "iu": "ю",
+        "IA": "Я",
+        "IE": "Є",
+        "IU": "Ю",
+        " ︡S": " С",
+        "yi": "ий",
+        "T́s̀": "Ц",
+        "t́s̀": "ц",
+        "źh̀": "ж",
+    }
+
+    PUBLISHER_REPLACEMENTS: dict[str, str] = {
+        "Вид-во": "",
+        "Ізд-во": "",
+        "Видавництво": "",
+        "Вид.": "",
+        "Ін-т": "Інститут",
+        "ін-т": "інститут",
+    }
+    PUBLISHER_PATTERN = re.compile("|".join(map(re.escape, PUBLISHER_REPLACEMENTS)))
+    PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+    # Drops the soft sign after labials and hushing consonants, and puts an
+    # apostrophe between a lowercase one and an iotated vowel.
+    SOFT_SIGN_PATTERN = re.compile(
+        r"([бпвмфгкхжчшр])ь?(?=[яюєї])|([бпвмфгкхжчшрБПВМФГКХЖЧШР])ь"
+    )
+    BRACELESS_PUNCTUATION_WITH_SPACE = (
+        punctuation.translate(str.maketrans("", "", "(){}[]")) + whitespace
+    )
+    CACHE_SIZE = 1 << 18
+
+    def __init__(self) -> None:
+        """
+        Initializes a UkrainianTransliterator object, compiling the letter mapping.
+
+        Returns:
+            None
+        """
+        pack = get_language_pack("uk")()
+        self.__steps = list(UkrainianTransliterator.LETTERS_MAPPING.items()) + [
+            (rule, pack.pre_processor_mapping[rule]) for rule in pack.pre_processor_mapping_keys
+        ]
+        self.__translation_table = pack.translation_table
+
+        self.__table = {key: self.__replace_in_order(key) for key, _ in self.__steps}
+        self.__pattern = self.__compile(self.__table)
+        while mismatches := {
+            key: expected
+            for key in self.__overlaps()
+            if (expected := self.__replace_in_order(key)) != self.__replace_letters(key)
+        }:
+            self.__table.update(mismatches)
+            self.__pattern = self.__compile(self.__table)
+
+        self.transliterate = lru_cache(maxsize=UkrainianTransliterator.CACHE_SIZE)(
+            self.__transliterate
+        )
+
+    def __replace_in_order(self, text: str) -> str:
+        """
+        Applies the replacements one after another.
+
+        Args:
+            text (str): The romanized text.
+
+        Returns:
+            str: The text with every replacement applied in order.
+        """
+        for original, replacement in self.__steps:
+            text = text.replace(original, replacement)
+        return text
+
+    def __transliterate(self, text: str, publisher: bool = False) -> str:
+        """
+        Transliterates the given text from a Latin-based script to Ukrainian Cyrillic script.
+
+        Args:
+            text (str): The text to be transliterated.
+            publisher (bool, optional): Whether the text is a publisher name. Defaults to False.
+
+        Returns:
+            str: The transliterated text.
+        """
+        text = self.__replace_letters(text).translate(self.__translation_table)
+        if publisher:
+            text = UkrainianTransliterator.PUBLISHER_PATTERN.sub(
+                lambda m: UkrainianTransliterator.PUBLISHER_REPLACEMENTS[m.group()], text
+            )
+        text = UkrainianTransliterator.PUNCTUATION_PATTERN.sub(
+            "", text.strip(UkrainianTransliterator.BRACELESS_PUNCTUATION_WITH_SPACE)
+        )
+        return UkrainianTransliterator.SOFT_SIGN_PATTERN.sub(
+            lambda m: f"{m.group(1)}'" if m.group(1) else m.group(2), text
+        )
+
+    def __replace_letters(self, text: str) -> str:
+        """
+        Applies the compiled replacements in a single pass.
+
+        Args:
+            text (str): The romanized text.
+
+        Returns:
+            str: The text with the mapping applied.
+        """
+        return self.__pattern.sub(lambda m: self.__table[m.group()], text)
+
+    def __overlaps(self) -> set[str]:
+        """
+        Lists the table keys and every string in which two keys overlap, either
+        directly or through the replacement of the first one.
+
+        Returns:
+            set[str]: The strings whose single-pass result has to be checked.
+        """
+        overlaps = set(self.__table)
+        for first, replacement in self.__table.items():
+            for second in self.__table:
+                for k in range(1, len(second)):
+                    if first[-k:] == second[:k] or replacement[-k:] == second[:k]:
+                        overlaps.add(first + second[k:])
+                    if second[-k:] == first[:k] or second[-k:] == replacement[:k]:
+                        overlaps.add(second[:-k] + first)
+        return overlaps
+
+    @staticmethod
+    def __compile(table: dict[str, str]) -> re.Pattern:
+        """
+        Compiles the keys of a table into an alternation, longest first.
+
+        Args:
+            table (dict[str, str]): The replacement table.
+
+        Returns:
+            re.Pattern: The compiled alternation.
+        """
+        return re.compile("|".join(map(re.escape, sorted(table, key=len, reverse=True))))
@@ -0,0 +1,194 @@
+from datetime import datetime
+from typing import Iterator, Sequence
+
+import numpy as np
+
+
+class UserGenerator:
+    """
+    Generates synthetic library users in bulk.
+
+    First and last names are sampled with NumPy from the name pools of the
+    Faker person provider, with Faker's own weights, so Faker is only queried
+    once for its pools instead of several times per user. Genders and
+    birthdays are drawn for a whole chunk at once, and emails are made unique
+    with a counter of every (first name, last name) pair.
+
+    Attributes:
+        __rng (np.random.Generator): The random generator.
+        __first_names (dict[str, tuple[np.ndarray, np.ndarray]]): The first name
+            pool and its probabilities for every gender.
+        __last_names (dict[str, tuple[np.ndarray, np.ndarray]]): The last name
+            pool and its probabilities for every gender.
+        __email_counts (dict[tuple[str, str], int]): The number of users with
+            every (first name, last name) pair.
+    """
+
+    GENDERS = np.array(["male", "female", "non-binary"])
+    GENDER_WEIGHTS = np.array([4, 4, 1]) / 9
+    EMAIL_DOMAIN = "knyhozbirnia.com"
+    ROLE = "USER"
+    CHUNK_SIZE = 100_000
+    BIRTH_START_YEAR = 1960
+
+    def __init__(self, fake, seed: int | None = None) -> None:
+        """
+        Initializes a UserGenerator object.
+
+        Args:
+            fake (Faker): The Faker instance whose name pools are sampled.
+            seed (int | None): The seed of the random generator.
+
+        Returns:
+            None
+        """
+        self.__rng = np.random.default_rng(seed)
+        provider = next(
+            provider for provider in fake.providers if hasattr(provider, "first_names")
+        )
+        self.__first_names = {
+            "male": self.__pool(getattr(provider, "first_names_male", provider.first_names)),
+            "female": self.__pool(getattr(provider, "first_names_female", provider.first_names)),
+            "non-binary": self.__pool(provider.first_names),
+        }
+        self.__last_names = {
+            "male": self.__pool(getattr(provider, "last_names_male", provider.last_names)),
+            "female": self.__pool(getattr(provider, "last_names_female", provider.last_names)),
+            "non-binary": self.__pool(provider.last_names),
+        }
+        self.__email_counts: dict[tuple[str, str], int] = {}
+
+    def generate(self, user_ids: Sequence[int]) -> list[tuple]:
+        """
+        Generates the users with the given IDs.
+
+        Args:
+            user_ids (Sequence[int]): The user IDs.
+
+        Returns:
+            list[tuple]: The user rows: ID, first name, last name, gender initial,
+                email, birthday, role and creation time.
+        """
+        user_ids = np.asarray(user_ids).tolist()
+        count = len(user_ids)
+        genders = self.__rng.choice(
+            len(UserGenerator.GENDERS), size=count, p=UserGenerator.GENDER_WEIGHTS
+        )
+        first_names = np.empty(count, dtype=object)
+        last_names = np.empty(count, dtype=object)
+        for index, gender in enumerate(UserGenerator.GENDERS):
+            mask = genders == index
+            first_names[mask] = self.__sample(self.__first_names[gender], int(mask.sum()))
+            last_names[mask] = self.__sample(self.__last_names[gender], int(mask.sum()))
+
+        first_names = first_names.tolist()
+        last_names = last_names.tolist()
+        created_at = datetime.now().isoformat()
+        return list(
+            zip(
+                user_ids,
+                first_names,
+                last_names,
+                (gender[0] for gender in UserGenerator.GENDERS[genders].tolist()),
+                self.__emails(first_names, last_names),
+                self.birthdays(count).tolist(),
+                [UserGenerator.ROLE] * count,
+                [created_at] * count,
+            )
+        )
+
+    def generate_chunks(self, user_ids: Sequence[int]) -> Iterator[list[tuple]]:
+        """
+        Generates the users with the given IDs in chunks of `CHUNK_SIZE`.
+
+        Args:
+            user_ids (Sequence[int]): The user IDs.
+
+        Yields:
+            list[tuple]: The user rows of a chunk.
+        """
+        for start in range(0, len(user_ids), UserGenerator.CHUNK_SIZE):
+            yield self.generate(user_ids[start : start + UserGenerator.CHUNK_SIZE])
+
+    def birthdays(
+        self,
+        count: int,
+        start_year: int = BIRTH_START_YEAR,
+        end_year: int = datetime.now().year - 6,
+    ) -> np.ndarray:
+        """
+        Draws random birthdays: 80% between `start_year + 15` and `end_year - 11`,
+        10% before and 10% after.
+
+        Args:
+            count (int): The number of birthdays.
+            start_year (int): The earliest birth year.
+            end_year (int): The latest birth year.
+
+        Returns:
+            np.ndarray: The birthdays as ISO date strings.
+        """
+        bands = self.__rng.random(count)
+        years = np.select(
+            [bands < 0.8, bands < 0.9],
+            [
+                self.__rng.integers(start_year + 15, end_year - 11, count, endpoint=True),
+                self.__rng.integers(start_year, start_year + 14, count, endpoint=True),
+            ],
+            self.__rng.integers(end_year - 10, end_year, count, endpoint=True),
+        )
+        days = self.__rng.integers(1, 365, count, endpoint=True)
+        dates = (years - 1970).astype("datetime64[Y]").astype("datetime64[D]") + days
+        return np.datetime_as_string(dates, unit="D")
+
+    def __emails(self, first_names: list[str], last_names: list[str]) -> list[str]:
+        """
+        Builds unique emails, suffixing the repeated names with a counter.
+
+        Args:
+            first_names (list[str]): The first names.
+            last_names (list[str]): The last names.
+
+        Returns:
+            list[str]: The emails.
+        """
+        emails = []
+        counts = self.__email_counts
+        for name in zip(first_names, last_names):
+            index = counts.get(name, 0)
+            counts[name] = index + 1
+            suffix = index - 1 if index else ""
+            emails.append(f"{name[0]}_{name[1]}{suffix}@{UserGenerator.EMAIL_DOMAIN}")
+        return emails
+
+    def __sample(self, pool: tuple[np.ndarray, np.ndarray], count: int) -> np.ndarray:
+        """
+        Samples names from a pool.
+
+        Args:
+            pool (tuple[np.ndarray, np.ndarray]): The names and their probabilities.
+            count (int): The number of names.
+
+        Returns:
+            np.ndarray: The sampled names.
+        """
+        names, probabilities = pool
+        return names[self.__rng.choice(len(names), size=count, p=probabilities)]
+
+    @staticmethod
+    def __pool(names) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Converts a Faker name list or weighted dictionary to a name pool.
+
+        Args:
+            names (Sequence[str] | dict[str, float]): The names, optionally weighted.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The names and their probabilities.
+        """
+        if isinstance(names, dict):
+            weights = np.array(list(names.values()), dtype=np.float64)
+            names = list(names.keys())
+        else:
+            weights = np.ones(len(names), dtype=np.float64)
+        return np.array(names, dtype=object), weights / weights.sum()
@@ -1,59 +1,147 @@
-import itertools
-import random
 from faker import Faker
-from datetime import datetime, timedelta
+from datetime import datetime
 from parsers.file_writer import FileWriter
+from parsers.user_generator import UserGenerator
+
+import numpy as np
 
 
 class UserManager(FileWriter):
-    def __init__(self, file_type: str):
+    """
+    Generates the readers of ratings, listings and loans and writes them.
+
+    Readers are drawn from an explicit activity model: an event belongs to a
+    new user with probability `arrival_scale / users`, so the number of users
+    grows with the square root of the number of events, and otherwise to an
+    existing user chosen in proportion to an activity weight drawn from a Zipf
+    distribution when the user is created. The user IDs, their weights and the
+    running sum of the weights are kept in growable NumPy arrays, so a batch of
+    events is assigned with a few array operations.
+    """
+
+    ARRIVAL_SCALE = 272
+    ACTIVITY_EXPONENT = 2.5
+    MAX_ACTIVITY = 10_000
+    MIN_BATCH_SIZE = 1024
+    INITIAL_CAPACITY = 1 << 16
+
+    def __init__(
+        self,
+        file_type: str,
+        arrival_scale: float = ARRIVAL_SCALE,
+        activity_exponent: float = ACTIVITY_EXPONENT,
+        seed: int | None = None,
+    ):
         """
         Initializes a User Manager object.
 
         Args:
             file_type (str): The type of file to be written.
+            arrival_scale (float): The number of users below which every event
+                creates a new user; beyond it, the chance of a new user is
+                `arrival_scale` divided by the number of users.
+            activity_exponent (float): The exponent of the Zipf distribution of
+                the activity weights of the users.
+            seed (int | None): The seed of the random generator.
 
         Attributes:
-            users (list): A list to store user objects.
-            usersId (itertools.count): An iterator to generate unique user IDs.
+            users (np.ndarray): The int32 IDs of the generated users.
             default_pfp (dict): A dictionary representing the default profile picture.
-            user_file (file): A file object to write user data.
+            generator (UserGenerator): The bulk generator of the user details.
+            user_file (TableSink): The sink writing user data.
         """
         FileWriter.__init__(self, file_type)
 
         self.fake = Faker()
-        self.users = []
-        self.usersId = itertools.count(1)
+        self.arrival_scale = arrival_scale
+        self.activity_exponent = activity_exponent
+        self.__rng = np.random.default_rng(seed)
+        self.__user_ids = np.empty(UserManager.INITIAL_CAPACITY, dtype=np.int32)
+        self.__cumulative_activity = np.empty(UserManager.INITIAL_CAPACITY, dtype=np.float64)
+        self.__count = 0
         self.default_pfp = {
             "user_id": 1,
             "url": "https://storage.cloud.google.com/data_warehousing_library_data/default-pfp.svg",
         }
-        self.emails = set()
-
-        self.random_genders = [
-            "male",
-            "female",
-            "non-binary",
-        ]
-        self.gender_weights = [4, 4, 1]
+        self.generator = UserGenerator(self.fake, seed)
 
         self.user_file = None
 
-    def get_or_generate_reader(self) -> dict[int, str] | int | None:
+    @property
+    def users(self) -> np.ndarray:
+        """
+        The IDs of the generated users.
+
+        Returns:
+            np.ndarray: A view of the int32 user IDs.
+        """
+        return self.__user_ids[: self.__count]
+
+    def get_or_generate_reader(self) -> int:
         """
-        Retrieves an existing user ID from the list of users or generates a new one.
+        Retrieves an existing user ID or generates a new one for a single event.
 
         Returns:
-            dict: The user ID.
+            int: The user ID.
         """
-        if not self.users or random.random() < 20000 / len(self.users) / random.randint(
-            1, 500
-        ):
-            if not (id := next(self.usersId)):
-                return None
-            self.users.append(id)
-            return id
-        return random.choice(self.users)
+        return int(self.get_or_generate_readers(1)[0])
+
+    def get_or_generate_readers(self, count: int) -> np.ndarray:
+        """
+        Assigns a reader to every event of a batch, generating new users as needed.
+
+        The batch is split into steps of at least as many events as there are
+        users, within which the chance of a new user is taken as constant.
+
+        Args:
+            count (int): The number of events.
+
+        Returns:
+            np.ndarray: The int32 user ID of every event.
+        """
+        readers = np.empty(count, dtype=np.int32)
+        done = 0
+        while done < count:
+            users = self.__count
+            size = min(count - done, max(users, UserManager.MIN_BATCH_SIZE))
+            is_new = self.__rng.random(size) < min(1.0, self.arrival_scale / max(users, 1))
+            new = int(is_new.sum())
+            step = readers[done : done + size]
+            step[is_new] = self.__add_users(new)
+
+            if existing := size - new:
+                cumulative = self.__cumulative_activity[:users]
+                picks = np.searchsorted(
+                    cumulative, self.__rng.random(existing) * cumulative[-1], side="right"
+                )
+                step[~is_new] = self.__user_ids[picks]
+            done += size
+        return readers
+
+    def __add_users(self, count: int) -> np.ndarray:
+        """
+        Creates new users with random activity weights.
+
+        Args:
+            count (int): The number of new users.
+
+        Returns:
+            np.ndarray: The int32 IDs of the new users.
+        """
+        start, end = self.__count, self.__count + count
+        if end > len(self.__user_ids):
+            capacity = max(end, 2 * len(self.__user_ids))
+            self.__user_ids = np.resize(self.__user_ids, capacity)
+            self.__cumulative_activity = np.resize(self.__cumulative_activity, capacity)
+
+        activity = np.minimum(
+            self.__rng.zipf(self.activity_exponent, count), UserManager.MAX_ACTIVITY
+        ).astype(np.float64)
+        offset = self.__cumulative_activity[start - 1] if start else 0.0
+        self.__cumulative_activity[start:end] = offset + np.cumsum(activity)
+        self.__user_ids[start:end] = np.arange(start + 1, end + 1, dtype=np.int32)
+        self.__count = end
+        return self.__user_ids[start:end]
 
     def fill_user(self, user_id) -> tuple[int, str, str, str, str, str, str, str]:
         """
@@ -63,71 +151,17 @@ class UserManager(FileWriter):
         - user_id: The ID of the user.
 
         Returns:
-        - A dictionary containing the user details:
+        - A tuple containing the user details:
             - user_id: The ID of the user.
             - first_name: The first name of the user.
             - last_name: The last name of the user.
             - gender: The gender of the user.
             - email: The email address of the user.
             - birthday: The birthday of the user.
+            - role: The role of the user.
             - created_at: The timestamp when the user was added.
-        """    
-        gender = random.choices(self.random_genders, weights=self.gender_weights, k=1)[0]
-        if gender == "male":
-            get_first_name = self.fake.first_name_male
-            get_last_name = self.fake.last_name_male
-        elif gender == "female":
-            get_first_name = self.fake.first_name_female
-            get_last_name = self.fake.last_name_female
-        else:
-            get_first_name = self.fake.first_name
-            get_last_name = self.fake.last_name
-        
-        first_name = get_first_name()
-        last_name = get_last_name()
-
-        email = f"{first_name}_{last_name}@knyhozbirnia.com"
-        index = 0
-        while email in self.emails:
-            email = f"{first_name}_{last_name}{index}@knyhozbirnia.com"
-            index+=1
-        self.emails.add(email)
-
-        return (
-            user_id,
-            first_name,
-            last_name,
-            gender[0],
-            email,
-            self.random_birthday(),
-            "USER",
-            datetime.now().isoformat(),
-        )
-
-    @staticmethod
-    def random_birthday(
-        start_year: int = 1960, end_year: int = datetime.now().year - 6
-    ) -> str:
         """
-        Generate a random birthday between the specified start_year and end_year.
-
-        Parameters:
-        - start_year (int): The starting year for generating the random birthday. Default is 1950.
-        - end_year (int): The ending year for generating the random birthday. Default is the current year.
-
-        Returns:
-        - birthday (datetime): A randomly generated birthday as a datetime object.
-        """
-        rand_year = random.random()  # Generate a random number between 0 and 1
-        if rand_year < 0.8:  # 80% chance to generate a year between 1975 and 2005
-            year =  random.randint(start_year+15, end_year - 11)
-        elif rand_year < 0.9:  # 10% chance to generate a year between 1950 and 1974
-            year = random.randint(start_year, start_year+14)
-        else:  # 10% chance to generate a year between 2006 and 2017
-            year = random.randint(end_year - 10, end_year)
-        day = random.randint(1, 365)
-        birthday = datetime(year, 1, 1) + timedelta(days=day)
-        return birthday.date().isoformat()
+        return self.generator.generate([user_id])[0]
 
     def write_user(self, user):
         """
@@ -140,17 +174,16 @@ class UserManager(FileWriter):
             None
         """
         if not self.user_file:
-            self.user_file = open(
-                self.get_user_file(), "w", encoding="utf-8", newline=""
-            )
-        self._tuple_write_strategy(self.user_file, [self.fill_user(user)])
+            self.user_file = self.open_sink(self.get_user_file(), "library_user")
+        self.user_file.append(self.fill_user(user))
+        self.user_file.flush()
 
     def write_users(self):
         """
-        Writes the users to the user file using the specified write strategy.
+        Writes the users to the user file.
 
-        This method iterates over the list of users and writes each user to the user file
-        using the write strategy specified in the `_write_strategy` attribute.
+        The user details are generated in bulk and streamed to the user file in
+        chunks of `UserGenerator.CHUNK_SIZE` users.
 
         Args:
             None
@@ -159,14 +192,20 @@ class UserManager(FileWriter):
             None
         """
         print(f"Processing users - {datetime.now().isoformat()}", flush=True)
-        self.user_file = open(self.get_user_file(), "w", encoding="utf-8", newline="")
-
-        users = [self.fill_user(user) for user in self.users]
+        start = datetime.now()
+        self.user_file = self.open_sink(self.get_user_file(), "library_user")
 
-        self._tuple_write_strategy(self.user_file, users)
-        self.user_file.flush()
+        for users in self.generator.generate_chunks(self.users):
+            self.user_file.extend(users)
         self.user_file.close()
 
+        elapsed = (datetime.now() - start).total_seconds()
+        print(
+            f"Wrote {len(self.users)} users ({len(self.users) / max(elapsed, 1e-9):.0f} users/s)"
+            f" - {datetime.now().isoformat()}",
+            flush=True,
+        )
+
     def writePfp(self):
         """
         Writes the default profile picture (pfp) to a file.
@@ -179,8 +218,8 @@ class UserManager(FileWriter):
         Returns:
             None
         """
-        with open(self.get_pfp_file(), "w", encoding="utf-8", newline="") as f_in:
-            self._write_strategy(f_in, self.default_pfp)
+        with self.open_sink(self.get_pfp_file(), "pfp") as sink:
+            sink.append(tuple(self.default_pfp.values()))
 
     def get_user_file(self):
         """